@@ -1,8 +1,68 @@
-def run_app() -> None:
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def run_app(
+    profile_dir: str | None = None,
+    latency_budget_ms: float | None = None,
+    trace_memory: bool = False,
+    perf_hud: bool = False,
+) -> None:
+    import os
+    import time
     import tkinter as tk
 
+    from app.controller import ToDoController
     from app.gui.main_window import MainWindow
+    from app.perf import PerfMonitor
+    from app.profiling import CallbackProfiler
+    from app.sqlite_controller import SQLiteController
+    from app.storage import JournalStore, default_data_dir
+    from app.task_store import ColumnarTaskStore, DictTaskStore, TaskStore
+
+    data_dir = default_data_dir()
+    profile_dir = profile_dir or os.environ.get("TODO_LIST_PROFILE")
+    profiler: CallbackProfiler | None = None
+    if profile_dir:
+        if profile_dir == "1":
+            profile_dir = str(
+                data_dir / "profiles" / time.strftime("%Y%m%d-%H%M%S")
+            )
+        if latency_budget_ms is None:
+            latency_budget_ms = float(
+                os.environ.get("TODO_LIST_PROFILE_BUDGET_MS", "50")
+            )
+        profiler = CallbackProfiler(
+            profile_dir,
+            budget_ms=latency_budget_ms,
+            trace_memory=trace_memory
+            or bool(os.environ.get("TODO_LIST_PROFILE_MEMORY")),
+        )
+        profiler.install()
 
+    controller: ToDoController | SQLiteController
+    if os.environ.get("TODO_LIST_BACKEND") == "sqlite":
+        data_dir.mkdir(parents=True, exist_ok=True)
+        controller = SQLiteController(data_dir / "tasks.sqlite3")
+    else:
+        task_store: TaskStore = (
+            ColumnarTaskStore()
+            if os.environ.get("TODO_LIST_TASK_STORE") == "columnar"
+            else DictTaskStore()
+        )
+        # Loaded in steps by the window, after its first paint
+        controller = ToDoController(
+            JournalStore(data_dir), task_store, defer_load=True
+        )
     root: tk.Tk = tk.Tk()
-    MainWindow(root)
-    root.mainloop()
+    perf_hud = perf_hud or bool(os.environ.get("TODO_LIST_PERF_HUD"))
+    MainWindow(root, controller, PerfMonitor() if perf_hud else None)
+    try:
+        root.mainloop()
+    finally:
+        controller.close()
+        if profiler is not None:
+            profiler.write_stats()
+            profiler.uninstall()
+            logger.info("Profile written to %s", profiler.output_dir)
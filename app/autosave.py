@@ -0,0 +1,69 @@
+import time
+import tkinter as tk
+
+from app.controller import ToDoController
+from app.sqlite_controller import SQLiteController
+
+QUIET_MS = 1000
+MAX_DELAY_MS = 5000
+
+
+class AutoSaver:
+    """Coalesce controller writes into one save per burst of changes.
+
+    The controller is switched to write-behind mode and reports each
+    change through ``on_dirty``. A save happens once no change has been
+    made for ``quiet_ms``, or at the latest ``max_delay_ms`` after the
+    first unsaved change, so steady typing or a bulk operation cannot
+    postpone it forever. Call ``flush`` before the window closes.
+    """
+
+    def __init__(
+        self,
+        root: tk.Misc,
+        controller: ToDoController | SQLiteController,
+        quiet_ms: int = QUIET_MS,
+        max_delay_ms: int = MAX_DELAY_MS,
+    ) -> None:
+        self.root: tk.Misc = root
+        self.controller: ToDoController | SQLiteController = controller
+        self.quiet: float = quiet_ms / 1000
+        self.max_delay: float = max_delay_ms / 1000
+        self._first: float = 0.0
+        self._last: float = 0.0
+        self._timer: str | None = None
+        controller.write_behind = True
+        controller.on_dirty = self.mark_dirty
+
+    def mark_dirty(self) -> None:
+        # Called on every mutation, so it only records the time; the
+        # timer re-arms itself when it fires too early.
+        now = time.monotonic()
+        self._last = now
+        if self._timer is None:
+            self._first = now
+            self._timer = self.root.after(
+                int(self.quiet * 1000), self._on_timer
+            )
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self.root.after_cancel(self._timer)
+            self._timer = None
+        self.controller.save()
+
+    def close(self) -> None:
+        self.flush()
+        self.controller.on_dirty = None
+        self.controller.write_behind = False
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        now = time.monotonic()
+        due = min(self._last + self.quiet, self._first + self.max_delay)
+        if now < due:
+            self._timer = self.root.after(
+                max(1, int((due - now) * 1000)), self._on_timer
+            )
+            return
+        self.controller.save()
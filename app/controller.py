@@ -1,72 +1,830 @@
-from app.models import Category, Task
+import functools
+import sys
+from array import array
+from collections.abc import (
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from itertools import islice
+from typing import Any, TypeVar, cast
+
+from app.events import (
+    CATEGORY_ADDED,
+    CATEGORY_REMOVED,
+    TASK_ADDED,
+    TASK_COMPLETED,
+    TASK_REMOVED,
+    TASK_UPDATED,
+    Change,
+    ChangeFeed,
+)
+from app.field_index import FieldIndex
+from app.history import History, Op, TaskState, task_state
+from app.models import (
+    Category,
+    Task,
+    TaskCounts,
+    compact_fields,
+    intern_name,
+)
+from app.query import Condition
+from app.search_index import SearchIndex
+from app.sorted_view import SortedView
+from app.storage import JournalStore
+from app.task_store import DictTaskStore, TaskStore, insert_in_order
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+LOAD_CHUNK = 2000
+
+
+def _loaded(method: F) -> F:
+    """Finish a deferred load before running a mutation."""
+
+    @functools.wraps(method)
+    def wrapper(self: "ToDoController", *args: Any, **kwargs: Any) -> Any:
+        if self._loading is not None:
+            self.finish_loading()
+        return method(self, *args, **kwargs)
+
+    return cast(F, wrapper)
 
 
 class ToDoController:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        journal: JournalStore | None = None,
+        task_store: TaskStore | None = None,
+        write_behind: bool = False,
+        defer_load: bool = False,
+    ) -> None:
         self.categories: list[Category] = [
             Category("All"),
             Category("Work"),
             Category("Personal"),
             Category("Shopping"),
         ]
-        self.tasks: list[Task] = []
+        self._next_id: int = 1
+        # task id -> task, in id order
+        self._tasks: TaskStore = (
+            task_store if task_store is not None else DictTaskStore()
+        )
+        # category name -> task ids in id order (dict used as ordered set)
+        self._by_category: dict[str | None, dict[int, None]] = {}
+        # category name -> ids of its completed tasks; with the buckets
+        # this gives per-category counts and the status filters
+        self._completed: dict[str | None, set[int]] = {}
+        self._search: SearchIndex = SearchIndex(self._tasks)
+        self._fields: FieldIndex = FieldIndex()
+        # sort spec -> maintained order, created on first use
+        self._orders: dict[str, SortedView] = {}
+        # Bumped on every mutation so views can tell when results are stale
+        self.version: int = 0
+        # What each mutation changed, for views that update incrementally
+        self.changes: ChangeFeed = ChangeFeed()
+        self._journal: JournalStore | None = journal
+        # Changed since the last save; records are built from the current
+        # state at save time, so repeated edits to a task cost one record.
+        self._dirty_tasks: set[int] = set()
+        self._dirty_categories: dict[str, None] = {}
+        # When set, mutations only mark state dirty and call ``on_dirty``;
+        # the owner decides when to ``save``.
+        self.write_behind: bool = write_behind
+        self.on_dirty: Callable[[], None] | None = None
+        # Undo log; mutations record their inverse operations when set
+        self.history: History | None = None
+        # With defer_load, tasks are read by load_step() calls so a window
+        # can paint the first of them while the rest stream in.
+        self._loading: Generator[int, None, None] | None = None
+        if journal is not None:
+            self._loading = self._load(journal)
+            if not defer_load:
+                self.finish_loading()
+
+    @property
+    def loading(self) -> bool:
+        return self._loading is not None
 
+    def load_step(self, count: int = LOAD_CHUNK) -> bool:
+        """Load up to ``count`` more tasks; True while more remain.
+
+        Categories and the next id are final before the first task, and
+        any mutation finishes the load first, so a partial model can be
+        shown but never saved.
+        """
+        if self._loading is None:
+            return False
+        loaded = list(islice(self._loading, count))
+        self.version += 1
+        self.changes.publish(Change(TASK_ADDED, i) for i in loaded)
+        if len(loaded) < count:
+            self._loading = None
+        return self._loading is not None
+
+    def finish_loading(self) -> None:
+        while self.load_step():
+            pass
+
+    @property
+    def tasks(self) -> list[Task]:
+        return list(self._tasks.values())
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Every task in id order, read from the store one at a time.
+
+        The ids are copied first, so the model may change while this is
+        consumed (an export spans many event-loop turns); tasks deleted
+        meanwhile are skipped.
+        """
+        get = self._tasks.get
+        for task_id in array("q", self._tasks.ids()):
+            task = get(task_id)
+            if task is not None:
+                yield task
+
+    @_loaded
     def add_category(self, name: str) -> bool:
         if name and name not in [c.name for c in self.categories]:
             self.categories.append(Category(name))
+            self._record("Add category", ("category-", name))
+            self._changed(categories=(name,))
             return True
         return False
 
+    @_loaded
     def add_task(
         self, title: str, category: str | None, **custom_fields: object
     ) -> Task:
-        task = Task(title, category=category, custom_fields=custom_fields)
-        self.tasks.append(task)
+        task = Task(
+            title,
+            category=category,
+            custom_fields=custom_fields,
+            task_id=self._next_id,
+        )
+        self._next_id += 1
+        self._tasks.add(task)
+        self._index_task(task)
+        self._search.add(task.id, title)
+        self._index_values(task)
+        self._record("Add task", ("delete", (task.id,)))
+        self._changed((task.id,), kind=TASK_ADDED)
         return task
 
+    @_loaded
+    def add_tasks(
+        self, records: Iterable[Mapping[str, Any]], merge_undo: bool = False
+    ) -> list[Task]:
+        """Add many tasks with a single journal write and version bump.
+
+        ``records`` use the keys of a journal task record (without
+        ``id``); unknown categories are created on the way. With
+        ``merge_undo`` the undo entry joins the previous import's, so a
+        file added in chunks is undone in one step.
+        """
+        known = {c.name for c in self.categories}
+        new_categories: list[str] = []
+        added: list[Task] = []
+        for record in records:
+            category = record.get("category")
+            if category is not None and category not in known:
+                known.add(category)
+                self.categories.append(Category(category))
+                new_categories.append(category)
+            task = Task(
+                record["text"],
+                category=category,
+                custom_fields=record.get("custom_fields"),
+                completed=bool(record.get("completed", False)),
+                task_id=self._next_id,
+            )
+            self._next_id += 1
+            self._tasks.add(task)
+            self._index_task(task)
+            self._search.add(task.id, task.text)
+            self._index_values(task)
+            added.append(task)
+        if added or new_categories:
+            self._record(
+                "Import tasks",
+                ("delete", tuple(t.id for t in added)),
+                *(("category-", name) for name in new_categories),
+                merge=merge_undo,
+            )
+            self._changed(
+                (t.id for t in added), new_categories, kind=TASK_ADDED
+            )
+        return added
+
+    def get_task(self, task_id: int) -> Task | None:
+        return self._tasks.get(task_id)
+
+    @_loaded
     def edit_task(
-        self,
-        index: int,
-        category: str | None,
-        title: str,
-        **custom_fields: object,
+        self, task_id: int, title: str, **custom_fields: object
     ) -> bool:
-        filtered: list[Task] = self.get_tasks_by_category(category)
-        if 0 <= index < len(filtered):
-            task = filtered[index]
-            task.text = title
-            task.custom_fields = custom_fields
-            return True
-        return False
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        self._record(
+            "Edit task", ("edit", task_id, task.text, task.custom_fields)
+        )
+        self._unindex_values(task)
+        self._search.update(task_id, task.text, title)
+        task.text = title
+        task.custom_fields = compact_fields(custom_fields)
+        self._index_values(task)
+        self._tasks.update(task)
+        self._changed((task_id,))
+        return True
 
-    def complete_task(self, index: int, category: str | None) -> bool:
-        filtered: list[Task] = self.get_tasks_by_category(category)
-        if 0 <= index < len(filtered):
-            task = filtered[index]
-            task.completed = True
-            return True
-        return False
+    @_loaded
+    def move_task(self, task_id: int, new_category: str | None) -> bool:
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        self._record("Move task", ("move", task_id, task.category))
+        self._unindex_task(task)
+        task.category = intern_name(new_category)
+        self._tasks.update(task)
+        self._index_task(task)
+        self._changed((task_id,))
+        return True
 
-    def delete_task(self, index: int, category: str | None) -> bool:
-        filtered: list[Task] = self.get_tasks_by_category(category)
-        if 0 <= index < len(filtered):
-            task = filtered[index]
-            self.tasks.remove(task)
-            return True
-        return False
+    @_loaded
+    def complete_task(self, task_id: int) -> bool:
+        task = self._tasks.get(task_id)
+        if task is None:
+            return False
+        self._record("Complete task", ("complete", task_id, task.completed))
+        self._unindex_values(task)
+        self._set_completed(task, True)
+        self._index_values(task)
+        self._tasks.update(task)
+        self._changed((task_id,), kind=TASK_COMPLETED)
+        return True
+
+    @_loaded
+    def delete_task(self, task_id: int) -> bool:
+        task = self._tasks.remove(task_id)
+        if task is None:
+            return False
+        self._unindex_task(task)
+        self._search.remove(task_id, task.text)
+        self._unindex_values(task)
+        self._record("Delete task", ("restore", (task_state(task),)))
+        self._changed((task_id,), kind=TASK_REMOVED)
+        return True
+
+    @_loaded
+    def complete_many(self, task_ids: Iterable[int]) -> int:
+        """Complete several tasks as one change; returns how many."""
+        ops: list[Op] = []
+        for task_id in task_ids:
+            task = self._tasks.get(task_id)
+            if task is None or task.completed:
+                continue
+            ops.append(("complete", task_id, False))
+            self._unindex_values(task)
+            self._set_completed(task, True)
+            self._index_values(task)
+            self._tasks.update(task)
+        if ops:
+            self._record("Complete tasks", *ops)
+            self._changed((op[1] for op in ops), kind=TASK_COMPLETED)
+        return len(ops)
+
+    @_loaded
+    def delete_many(self, task_ids: Iterable[int]) -> int:
+        removed = self._tasks.remove_many(task_ids)
+        for task in removed:
+            self._unindex_task(task)
+            self._search.remove(task.id, task.text)
+            self._unindex_values(task)
+        if removed:
+            self._record(
+                "Delete tasks", ("restore", tuple(map(task_state, removed)))
+            )
+            self._changed((t.id for t in removed), kind=TASK_REMOVED)
+        return len(removed)
+
+    @_loaded
+    def move_many(
+        self, task_ids: Iterable[int], new_category: str | None
+    ) -> int:
+        new_category = intern_name(new_category)
+        ops: list[Op] = []
+        moved: list[Task] = []
+        for task_id in task_ids:
+            task = self._tasks.get(task_id)
+            if task is None or task.category == new_category:
+                continue
+            ops.append(("move", task_id, task.category))
+            self._unindex_task(task)
+            task.category = new_category
+            self._tasks.update(task)
+            moved.append(task)
+        if moved:
+            self._index_tasks(moved)
+            self._record("Move tasks", *ops)
+            self._changed(t.id for t in moved)
+        return len(moved)
 
     def get_tasks_by_category(self, category: str | None) -> list[Task]:
         if category == "All":
             return self.tasks
-        return [
-            t for t in self.tasks if getattr(t, "category", None) == category
+        return self._materialize(self._by_category.get(category, {}))
+
+    def query_tasks(
+        self,
+        category: str | None,
+        status: str = "All",
+        text: str = "",
+        fields: dict[str, object] | None = None,
+        conditions: Sequence[Condition] = (),
+        sort: str = "id",
+    ) -> list[Task]:
+        """Tasks in ``category`` matching every filter, ordered by ``sort``.
+
+        ``fields`` is shorthand for equality conditions. Conditions are
+        answered from the field index and title text from the search
+        index; only the surviving ids are materialized. See
+        ``app.sorted_view`` for the sort specs.
+        """
+        text = text.strip().lower()
+        conditions = [
+            *conditions,
+            *(Condition(k, "=", str(v)) for k, v in (fields or {}).items()),
         ]
+        if category == "All":
+            bucket: Any = self._tasks
+        else:
+            bucket = self._by_category.get(category, {})
+        matches: set[int] | None = None
+        excluded: set[int] = set()
+        for condition in conditions:
+            found = self._fields.match(condition)
+            if condition.op == "!=":
+                excluded |= found
+            elif matches is None:
+                matches = found
+            else:
+                matches &= found
+        if status != "All":
+            done = self._completed_in(category)
+            if status == "Completed":
+                matches = set(done) if matches is None else matches & done
+            elif status == "Incomplete":
+                excluded |= done
+        if text:
+            if matches is None and category != "All":
+                matches = self._search.search(text, bucket.keys())
+            else:
+                matches = self._search.search(text, matches)
+        if matches is None and not excluded:
+            tasks = self.get_tasks_by_category(category)
+        else:
+            if matches is not None and len(matches) < len(bucket):
+                ids = [i for i in sorted(matches) if i in bucket]
+            else:
+                ids = [
+                    i
+                    for i in self._ids_in(category)
+                    if matches is None or i in matches
+                ]
+            tasks = self._materialize(i for i in ids if i not in excluded)
+        if sort != "id":
+            tasks = self._sorted(tasks, sort)
+        return tasks
+
+    def category_counts(self) -> dict[str | None, TaskCounts]:
+        """Total and completed tasks per category, plus "All"."""
+        counts = {
+            name: TaskCounts(len(bucket), len(self._completed.get(name, ())))
+            for name, bucket in self._by_category.items()
+        }
+        counts["All"] = TaskCounts(
+            len(self._tasks), sum(map(len, self._completed.values()))
+        )
+        return counts
+
+    def field_names(self) -> list[str]:
+        """Custom field keys used by at least one task."""
+        return self._fields.keys()
 
+    @_loaded
     def delete_category(self, name: str) -> bool:
         if name == "All":
             return False
+        names = [c.name for c in self.categories]
         self.categories = [c for c in self.categories if c.name != name]
-        self.tasks = [
-            t for t in self.tasks if getattr(t, "category", None) != name
-        ]
+        removed = self._by_category.pop(name, {})
+        self._completed.pop(name, None)
+        states: list[TaskState] = []
+        for task_id in removed:
+            task = self._tasks.remove(task_id)
+            if task is None:
+                continue
+            self._search.remove(task_id, task.text)
+            self._unindex_values(task)
+            if self.history is not None:
+                states.append(task_state(task))
+        if self.history is not None:
+            self._record(
+                "Delete category",
+                *(
+                    [("category+", name, names.index(name))]
+                    if name in names
+                    else []
+                ),
+                ("restore", tuple(states)),
+            )
+        self._changed(removed, (name,), kind=TASK_REMOVED)
         return True
+
+    def task_count(self) -> int:
+        return len(self._tasks)
+
+    @_loaded
+    def undo(self) -> str | None:
+        """Revert the last recorded change; returns its label."""
+        if self.history is None:
+            return None
+        return self.history.undo(self._apply_ops)
+
+    @_loaded
+    def redo(self) -> str | None:
+        if self.history is None:
+            return None
+        return self.history.redo(self._apply_ops)
+
+    def approx_memory(self) -> int | None:
+        """Rough size of the in-memory model, in bytes."""
+        return (
+            self._tasks.approx_bytes()
+            + self._search.approx_bytes()
+            + self._fields.approx_bytes()
+            + sum(view.approx_bytes() for view in self._orders.values())
+            + sys.getsizeof(self._by_category)
+            + sum(sys.getsizeof(b) for b in self._by_category.values())
+            + sum(sys.getsizeof(s) for s in self._completed.values())
+        )
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return bool(self._dirty_tasks or self._dirty_categories)
+
+    def save(self) -> int:
+        """Write every dirty task and category in one journal append.
+
+        Returns the number of records written.
+        """
+        journal = self._journal
+        if journal is None or not self.has_unsaved_changes:
+            return 0
+        positions = {c.name: i for i, c in enumerate(self.categories)}
+        # Removals first, then additions by position, so each one is
+        # inserted after the categories that precede it
+        records: list[dict[str, Any]] = [
+            {"op": "category-", "name": name}
+            for name in self._dirty_categories
+            if name not in positions
+        ]
+        records.extend(
+            {"op": "category", "name": name, "position": positions[name]}
+            for name in sorted(
+                (n for n in self._dirty_categories if n in positions),
+                key=positions.__getitem__,
+            )
+        )
+        for task_id in sorted(self._dirty_tasks):
+            task = self._tasks.get(task_id)
+            records.append(
+                {"op": "task-", "id": task_id}
+                if task is None
+                else {"op": "task", "task": self._task_record(task)}
+            )
+        journal.append(records)
+        self._dirty_tasks.clear()
+        self._dirty_categories.clear()
+        if journal.should_compact(len(self._tasks)):
+            journal.compact(
+                {
+                    "next_id": self._next_id,
+                    "categories": [c.name for c in self.categories],
+                },
+                map(self._task_record, self._tasks.values()),
+            )
+        return len(records)
+
+    def close(self) -> None:
+        if self._loading is not None:
+            self._loading.close()
+            self._loading = None
+        if self._journal is not None:
+            self.save()
+            self._journal.close()
+
+    def _ids_in(self, category: str | None) -> Any:
+        if category == "All":
+            return self._tasks.ids()
+        return self._by_category.get(category, {})
+
+    def _materialize(self, ids: Any) -> list[Task]:
+        get = self._tasks.get
+        return [task for task in map(get, ids) if task is not None]
+
+    def _sorted(self, tasks: list[Task], sort: str) -> list[Task]:
+        view = self._orders.get(sort)
+        if view is None:
+            view = self._orders[sort] = SortedView(
+                sort, self._tasks.values()
+            )
+        if len(tasks) * 8 < len(view):
+            # A few matches: sorting them beats walking the whole order
+            return sorted(tasks, key=view.key)
+        by_id = {task.id: task for task in tasks}
+        return [by_id[i] for i in view if i in by_id]
+
+    def _index_values(self, task: Task) -> None:
+        self._fields.add(task.id, task.custom_fields)
+        for view in self._orders.values():
+            view.add(task)
+
+    def _unindex_values(self, task: Task) -> None:
+        # Before the task changes: views find it by its current key
+        self._fields.remove(task.id, task.custom_fields)
+        for view in self._orders.values():
+            view.remove(task)
+
+    def _index_task(self, task: Task) -> None:
+        bucket = self._by_category.setdefault(task.category, {})
+        if bucket and task.id < next(reversed(bucket)):
+            # Moved or restored task: keep the bucket in id order, like
+            # the store and the SQLite backend.
+            insert_in_order(bucket, ((task.id, None),))
+        else:
+            bucket[task.id] = None
+        if task.completed:
+            self._completed.setdefault(task.category, set()).add(task.id)
+
+    def _index_tasks(self, tasks: Iterable[Task]) -> None:
+        """``_index_task`` for many tasks: one insert per bucket."""
+        by_category: dict[str | None, list[tuple[int, None]]] = {}
+        for task in tasks:
+            by_category.setdefault(task.category, []).append((task.id, None))
+            if task.completed:
+                self._completed.setdefault(task.category, set()).add(task.id)
+        for category, entries in by_category.items():
+            insert_in_order(
+                self._by_category.setdefault(category, {}), entries
+            )
+
+    def _unindex_task(self, task: Task) -> None:
+        bucket = self._by_category.get(task.category)
+        if bucket is not None:
+            bucket.pop(task.id, None)
+            if not bucket:
+                del self._by_category[task.category]
+        if task.completed:
+            self._discard_completed(task)
+
+    def _set_completed(self, task: Task, completed: bool) -> None:
+        if completed and not task.completed:
+            self._completed.setdefault(task.category, set()).add(task.id)
+        elif task.completed and not completed:
+            self._discard_completed(task)
+        task.completed = completed
+
+    def _discard_completed(self, task: Task) -> None:
+        done = self._completed.get(task.category)
+        if done is not None:
+            done.discard(task.id)
+            if not done:
+                del self._completed[task.category]
+
+    def _completed_in(self, category: str | None) -> set[int]:
+        if category == "All":
+            return set().union(*self._completed.values())
+        return self._completed.get(category, set())
+
+    # --- History ---
+
+    def _record(self, label: str, *ops: Op, merge: bool = False) -> None:
+        if self.history is not None:
+            self.history.record(label, list(ops), merge)
+
+    def _apply_ops(self, ops: list[Op]) -> list[Op]:
+        """Apply undo (or redo) operations; returns their inverse."""
+        inverse: list[Op] = []
+        task_ids: list[int] = []
+        categories: list[str] = []
+        changes: list[Change] = []
+        # Moved tasks go back into their buckets together, so undoing a
+        # bulk move is one ordered insert per category.
+        moved: list[Task] = []
+        for op in ops:
+            kind = op[0]
+            if moved and kind != "move":
+                self._index_tasks(moved)
+                moved = []
+            if kind == "delete":
+                removed = self._tasks.remove_many(op[1])
+                for task in removed:
+                    self._unindex_task(task)
+                    self._search.remove(task.id, task.text)
+                    self._unindex_values(task)
+                    task_ids.append(task.id)
+                    changes.append(Change(TASK_REMOVED, task.id))
+                inverse.append(("restore", tuple(map(task_state, removed))))
+            elif kind == "restore":
+                tasks = [
+                    Task(text, category, fields, completed, task_id)
+                    for task_id, text, category, fields, completed in op[1]
+                ]
+                self._restore_tasks(tasks)
+                task_ids.extend(t.id for t in tasks)
+                changes.extend(Change(TASK_ADDED, t.id) for t in tasks)
+                inverse.append(("delete", tuple(t.id for t in tasks)))
+            elif kind in ("category+", "category-"):
+                name = op[1]
+                names = [c.name for c in self.categories]
+                if kind == "category+" and name not in names:
+                    self.categories.insert(op[2], Category(name))
+                    inverse.append(("category-", name))
+                    changes.append(Change(CATEGORY_ADDED, name))
+                elif kind == "category-" and name in names:
+                    del self.categories[names.index(name)]
+                    inverse.append(("category+", name, names.index(name)))
+                    changes.append(Change(CATEGORY_REMOVED, name))
+                categories.append(name)
+            else:
+                task = self._tasks.get(op[1])
+                if task is None:
+                    continue
+                if kind == "edit":
+                    inverse.append(
+                        ("edit", task.id, task.text, task.custom_fields)
+                    )
+                    self._unindex_values(task)
+                    self._search.update(task.id, task.text, op[2])
+                    task.text, task.custom_fields = op[2], op[3]
+                    self._index_values(task)
+                elif kind == "move":
+                    inverse.append(("move", task.id, task.category))
+                    self._unindex_task(task)
+                    task.category = op[2]
+                    moved.append(task)
+                elif kind == "complete":
+                    inverse.append(("complete", task.id, task.completed))
+                    self._unindex_values(task)
+                    self._set_completed(task, op[2])
+                    self._index_values(task)
+                self._tasks.update(task)
+                task_ids.append(task.id)
+                changes.append(
+                    Change(
+                        TASK_COMPLETED if kind == "complete" else TASK_UPDATED,
+                        task.id,
+                    )
+                )
+        self._index_tasks(moved)
+        inverse.reverse()
+        self._changed(task_ids, categories, kind=None)
+        self.changes.publish(changes)
+        return inverse
+
+    def _restore_tasks(self, tasks: list[Task]) -> None:
+        """Put tasks back with their old ids, in id order everywhere."""
+        if not tasks:
+            return
+        self._tasks.restore(tasks)
+        self._index_tasks(tasks)
+        for task in tasks:
+            self._search.add(task.id, task.text)
+            self._index_values(task)
+        self._next_id = max(self._next_id, max(t.id for t in tasks) + 1)
+
+    # --- Persistence ---
+
+    @staticmethod
+    def _task_record(task: Task) -> dict[str, Any]:
+        return {
+            "id": task.id,
+            "text": task.text,
+            "category": task.category,
+            "custom_fields": dict(task.custom_fields),
+            "completed": task.completed,
+        }
+
+    def _changed(
+        self,
+        task_ids: Iterable[int] = (),
+        categories: Iterable[str] = (),
+        kind: str | None = TASK_UPDATED,
+    ) -> None:
+        """Bump the version, publish the change and mark it for saving.
+
+        ``kind`` is the change published for every task id (None when the
+        caller publishes its own); a category is reported as added when
+        it is now in the list and as removed otherwise.
+        """
+        self.version += 1
+        if kind is not None and self.changes.subscribed:
+            task_ids, categories = list(task_ids), list(categories)
+            names = {c.name for c in self.categories}
+            self.changes.publish(
+                [
+                    *(
+                        Change(
+                            CATEGORY_ADDED if n in names else CATEGORY_REMOVED,
+                            n,
+                        )
+                        for n in categories
+                    ),
+                    *(Change(kind, i) for i in task_ids),
+                ]
+            )
+        if self._journal is None:
+            return
+        self._dirty_tasks.update(task_ids)
+        self._dirty_categories.update(dict.fromkeys(categories))
+        if not self.write_behind:
+            self.save()
+        elif self.on_dirty is not None:
+            self.on_dirty()
+
+    def _load(self, journal: JournalStore) -> Generator[int, None, None]:
+        """Load the snapshot and journal, yielding each task's id.
+
+        The journal is read first: its last record for a task replaces
+        (or deletes) the snapshot's as the snapshot streams by, which
+        gives the same result as replaying it afterwards.
+        """
+        records = journal.read_snapshot()
+        header = next(records, None)
+        if header is not None:
+            self.categories = [Category(n) for n in header["categories"]]
+            self._next_id = header["next_id"]
+        changes: dict[int, dict[str, Any] | None] = {}
+        for record in journal.read_journal():
+            op = record["op"]
+            if op == "task":
+                changes[record["task"]["id"]] = record["task"]
+            elif op == "task-":
+                changes[record["id"]] = None
+            elif op == "category":
+                name = record["name"]
+                position = record.get("position")
+                names = [c.name for c in self.categories]
+                if name in names:
+                    if position is None:
+                        continue
+                    del self.categories[names.index(name)]
+                self.categories.insert(
+                    len(self.categories) if position is None else position,
+                    Category(name),
+                )
+            elif op == "category-":
+                self.categories = [
+                    c for c in self.categories if c.name != record["name"]
+                ]
+        self._next_id = max(self._next_id, max(changes, default=0) + 1)
+        for record in records:
+            if record["id"] in changes:
+                changed = changes.pop(record["id"])
+                if changed is None:
+                    continue
+                record = changed
+            self._put_task(record)
+            yield record["id"]
+        for changed in changes.values():
+            if changed is not None:
+                self._put_task(changed)
+                yield changed["id"]
+
+    def _put_task(self, record: dict[str, Any]) -> None:
+        task = Task(
+            record["text"],
+            category=record["category"],
+            custom_fields=record["custom_fields"],
+            completed=record["completed"],
+            task_id=record["id"],
+        )
+        old = self._tasks.get(task.id)
+        if old is None:
+            # Usually appends; a task brought back by undo goes back to
+            # its id position.
+            self._tasks.restore((task,))
+            self._search.add(task.id, task.text)
+        else:
+            self._unindex_task(old)
+            self._unindex_values(old)
+            self._search.update(task.id, old.text, task.text)
+            self._tasks.update(task)
+        self._index_task(task)
+        self._index_values(task)
+        self._next_id = max(self._next_id, task.id + 1)
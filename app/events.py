@@ -0,0 +1,71 @@
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple
+
+Schedule = Callable[[Callable[[], None]], object]
+
+# Change kinds. "task_updated" covers edits and moves; "task_completed"
+# is any change of the completed flag, including undo reopening a task.
+TASK_ADDED = "task_added"
+TASK_UPDATED = "task_updated"
+TASK_COMPLETED = "task_completed"
+TASK_REMOVED = "task_removed"
+CATEGORY_ADDED = "category_added"
+CATEGORY_REMOVED = "category_removed"
+
+TASK_CHANGES = frozenset(
+    (TASK_ADDED, TASK_UPDATED, TASK_COMPLETED, TASK_REMOVED)
+)
+CATEGORY_CHANGES = frozenset((CATEGORY_ADDED, CATEGORY_REMOVED))
+
+
+class Change(NamedTuple):
+    kind: str
+    key: Any  # task id, or category name
+
+
+Subscriber = Callable[[list[Change]], None]
+
+
+class ChangeFeed:
+    """Changes published by a controller, delivered in batches.
+
+    The first change of a batch calls ``schedule(flush)``; a Tk window
+    sets it to ``root.after_idle`` so everything changed by one event
+    handler arrives together. Without a scheduler every publish is
+    delivered at once. Nothing is kept while no one is subscribed.
+    """
+
+    def __init__(self, schedule: Schedule | None = None) -> None:
+        self.schedule: Schedule | None = schedule
+        self._subscribers: list[Subscriber] = []
+        self._pending: list[Change] = []
+        self._scheduled: bool = False
+
+    @property
+    def subscribed(self) -> bool:
+        return bool(self._subscribers)
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def publish(self, changes: Iterable[Change]) -> None:
+        if not self._subscribers:
+            return
+        self._pending.extend(changes)
+        if self.schedule is None:
+            self.flush()
+        elif not self._scheduled and self._pending:
+            self._scheduled = True
+            self.schedule(self.flush)
+
+    def flush(self) -> None:
+        self._scheduled = False
+        changes, self._pending = self._pending, []
+        if not changes:
+            return
+        for subscriber in list(self._subscribers):
+            subscriber(changes)
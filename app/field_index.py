@@ -0,0 +1,89 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Mapping
+
+from app.perf import approx_size
+from app.query import Condition, FieldKey, field_key
+
+
+class FieldIndex:
+    """Secondary indexes over custom fields, one per field key.
+
+    Each key maps its normalized values to the ids holding them, which
+    answers equality directly, and keeps those values sorted so range
+    conditions only visit the matching values instead of every task.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[str, dict[FieldKey, set[int]]] = {}
+        self._sorted: dict[str, list[FieldKey]] = {}
+
+    def add(self, task_id: int, fields: Mapping[str, object]) -> None:
+        for key, value in fields.items():
+            values = self._values.get(key)
+            if values is None:
+                values = self._values[key] = {}
+                self._sorted[key] = []
+            normalized = field_key(value)
+            ids = values.get(normalized)
+            if ids is None:
+                values[normalized] = {task_id}
+                insort(self._sorted[key], normalized)
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id: int, fields: Mapping[str, object]) -> None:
+        for key, value in fields.items():
+            values = self._values.get(key)
+            if values is None:
+                continue
+            normalized = field_key(value)
+            ids = values.get(normalized)
+            if ids is None:
+                continue
+            ids.discard(task_id)
+            if not ids:
+                del values[normalized]
+                ordered = self._sorted[key]
+                del ordered[bisect_left(ordered, normalized)]
+                if not values:
+                    del self._values[key]
+                    del self._sorted[key]
+
+    def keys(self) -> list[str]:
+        return sorted(self._values)
+
+    def match(self, condition: Condition) -> set[int]:
+        """Ids whose field satisfies ``condition``.
+
+        ``!=`` is answered as the ids *with* an equal value; the caller
+        subtracts them, since tasks lacking the field also match.
+        """
+        values = self._values.get(condition.key)
+        if not values:
+            return set()
+        want = field_key(condition.value)
+        if condition.op in ("=", "!="):
+            return set(values.get(want, ()))
+        ordered = self._sorted[condition.key]
+        # Only values of the same kind (number or text) are compared
+        lo = bisect_left(ordered, (want[0],))
+        hi = bisect_left(ordered, (want[0] + 1,))
+        if condition.op == "<":
+            hi = bisect_left(ordered, want, lo, hi)
+        elif condition.op == "<=":
+            hi = bisect_right(ordered, want, lo, hi)
+        elif condition.op == ">":
+            lo = bisect_right(ordered, want, lo, hi)
+        else:
+            lo = bisect_left(ordered, want, lo, hi)
+        found: set[int] = set()
+        for value in ordered[lo:hi]:
+            found |= values[value]
+        return found
+
+    def approx_bytes(self) -> int:
+        return sum(
+            sys.getsizeof(values) + approx_size(values.values(), len(values))
+            for values in self._values.values()
+        )
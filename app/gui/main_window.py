@@ -1,30 +1,80 @@
 import os
+import queue
 import tkinter as tk
-from tkinter import ttk
-from typing import Any, Dict
-
-from PIL import Image, ImageTk
+from collections.abc import Iterator
+from itertools import batched
+from pathlib import Path
+from tkinter import messagebox, ttk
+from typing import TYPE_CHECKING, Any, Dict
 
+from app.autosave import AutoSaver
 from app.controller import ToDoController
 from app.gui.sidebar import Sidebar
+from app.gui.styles import create_themes, use_theme
 from app.gui.task_area import TaskArea
+from app.history import History
+from app.perf import PerfMonitor, format_bytes
+from app.sqlite_controller import SQLiteController
 from app.themes import THEMES
+from app.workers import TkExecutor, feed_job, iter_feed, report_progress
+
+if TYPE_CHECKING:
+    # Import/export modules load on first use, not at startup
+    from app.transfer import TaskRecord
+
+STATUS_INTERVAL_MS = 1000
+STATUS_CLEAR_MS = 5000
+EXPORT_BUFFER_CHUNKS = 4
+# Tasks loaded before the first paint of a deferred load; the rest
+# follows in chunks between events.
+FIRST_PAINT_TASKS = 200
+TRANSFER_FILETYPES = [
+    ("Task files", "*.jsonl *.csv"),
+    ("JSON Lines", "*.jsonl"),
+    ("CSV", "*.csv"),
+]
+
 
 class MainWindow:
-    def __init__(self, root: tk.Tk) -> None:
+    def __init__(
+        self,
+        root: tk.Tk,
+        controller: ToDoController | SQLiteController | None = None,
+        perf: PerfMonitor | None = None,
+    ) -> None:
         self.root: tk.Tk = root
         self.theme_name: str = "dark"
         self.theme: Dict[str, Any] = THEMES[self.theme_name]
-        self.controller: ToDoController = ToDoController()
+        self.controller: ToDoController | SQLiteController = (
+            controller or ToDoController()
+        )
         self.selected_category: str = "All"
         self.icons: Dict[str, Any] = self.load_icons()
         self.sidebar: Sidebar
         self.main: ttk.Frame
         self.task_area: TaskArea
         self.status_bar: ttk.Label
+        self.status_message: str = ""
+        self._status_clear: str | None = None
+        self.busy_indicator: ttk.Progressbar
+        self.executor: TkExecutor = TkExecutor(root, on_busy=self.set_busy)
+        self.transferring: bool = False
+        self.autosaver: AutoSaver = AutoSaver(root, self.controller)
+        # Views get the controller's changes once per idle cycle
+        self.controller.changes.schedule = root.after_idle
+        if self.controller.history is None:
+            self.controller.history = History()
+        self.edit_menu: tk.Menu
+        self.perf: PerfMonitor | None = perf
+        if perf is not None:
+            perf.instrument(self.controller.changes, "flush", "changes")
+        if self.controller.loading:
+            self.controller.load_step(FIRST_PAINT_TASKS)
         self.setup_style()
         self.build_gui()
-        self.fade_in()
+        if self.controller.loading:
+            self.show_status("Loading tasks...")
+            self.root.after_idle(self._load_more)
 
     def load_icons(self) -> Dict[str, Any]:
         icons: Dict[str, Any] = {}
@@ -33,72 +83,9 @@ class MainWindow:
         return icons
 
     def setup_style(self) -> None:
-        style: ttk.Style = ttk.Style(self.root)
-        style.theme_use("clam")
-        style.configure("Sidebar.TFrame", background=self.theme["sidebar"])
-        style.configure("Main.TFrame", background=self.theme["bg"])
-        style.configure(
-            "TLabel",
-            background=self.theme["bg"],
-            foreground=self.theme["fg"],
-            font=("Segoe UI Variable", 12),
-            padding=4,
-        )
-        style.configure(
-            "Sidebar.TLabel",
-            background=self.theme["sidebar"],
-            foreground=self.theme["fg"],
-            font=("Segoe UI Variable", 14, "bold"),
-            padding=6,
-        )
-        style.configure(
-            "Accent.TButton",
-            background=self.theme["button"],
-            foreground=self.theme["button_fg"],
-            font=("Segoe UI Variable", 11, "bold"),
-            borderwidth=0,
-            padding=6,
-        )
-        style.map(
-            "Accent.TButton", background=[("active", self.theme["accent"])]
-        )
-        style.configure(
-            "TEntry",
-            fieldbackground=self.theme["entry_bg"],
-            foreground=self.theme["entry_fg"],
-            font=("Segoe UI Variable", 11),
-            padding=4,
-        )
-        style.configure(
-            "Statusbar.TLabel",
-            background=self.theme["sidebar"],
-            foreground=self.theme["fg"],
-            font=("Segoe UI Variable", 10),
-            anchor="w",
-            padding=4,
-        )
-        # --- Dialog styles ---
-        style.configure("Dialog.TFrame", background="#23272e")
-        style.configure(
-            "DialogHeader.TLabel", background="#23272e", foreground="#fff"
-        )
-        style.configure(
-            "Dialog.TButton",
-            background="#444",
-            foreground="#fff",
-            font=("Segoe UI Variable", 10),
-            borderwidth=0,
-            padding=6,
-        )
-        style.configure(
-            "Accent.TButton",
-            background="#3b82f6",
-            foreground="#fff",
-            font=("Segoe UI Variable", 10, "bold"),
-            borderwidth=0,
-            padding=6,
-        )
-        style.map("Accent.TButton", background=[("active", "#2563eb")])
+        # Every theme's styles are built once; switching only selects one
+        create_themes(self.root)
+        use_theme(self.root, self.theme_name)
 
     def build_gui(self) -> None:
         self.root.configure(bg=self.theme["bg"])
@@ -115,7 +102,6 @@ class MainWindow:
             self.icons,
             self.theme,
             self.select_category,
-            self.refresh_categories,
             self.switch_theme,
         )
         self.sidebar.grid(row=0, column=0, sticky="nswe", padx=(0, 2), pady=2)
@@ -131,46 +117,279 @@ class MainWindow:
             self.icons,
             self.theme,
             self.get_selected_category,
-            self.refresh_tasks,
         )
         self.task_area.grid(row=0, column=0, sticky="nsew")
 
-        self.refresh_categories()
-        self.refresh_tasks()
+        self.build_menu()
+        self.status_bar = ttk.Label(self.root, style="Statusbar.TLabel")
+        self.busy_indicator = ttk.Progressbar(
+            self.root, mode="indeterminate", length=120
+        )
+        if self.perf is not None:
+            self.perf.instrument(self.task_area, "refresh", "refresh_tasks")
+            # Sidebar changes arrive through the feed, as a rebuild of the
+            # buttons or just their badges; both count as a refresh
+            for method in ("refresh", "update_counts"):
+                self.perf.instrument(
+                    self.sidebar, method, "refresh_categories"
+                )
+            self.perf.instrument(self.task_area, "_run_search", "search")
+            self.status_bar.grid(row=1, column=0, columnspan=2, sticky="we")
+            self.root.after(STATUS_INTERVAL_MS, self.update_status)
+
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.task_area.refresh()
         self.root.title("To-Do List - All")
 
+    def build_menu(self) -> None:
+        menubar = tk.Menu(self.root)
+        file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(
+            label="Import Tasks...", command=self.import_tasks
+        )
+        file_menu.add_command(
+            label="Export Tasks...", command=self.export_tasks
+        )
+        file_menu.add_separator()
+        file_menu.add_command(label="Quit", command=self.on_close)
+        menubar.add_cascade(label="File", menu=file_menu)
+        self.edit_menu = tk.Menu(
+            menubar, tearoff=0, postcommand=self.update_edit_menu
+        )
+        self.edit_menu.add_command(
+            label="Undo", accelerator="Ctrl+Z", command=self.undo
+        )
+        self.edit_menu.add_command(
+            label="Redo", accelerator="Ctrl+Y", command=self.redo
+        )
+        menubar.add_cascade(label="Edit", menu=self.edit_menu)
+        self.root.configure(menu=menubar)
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
+        self.root.bind("<Control-Z>", lambda e: self.redo())
+        self.root.bind("<Control-Shift-Z>", lambda e: self.redo())
+
+    def update_edit_menu(self) -> None:
+        history = self.controller.history
+        undo = history.undo_label if history is not None else None
+        redo = history.redo_label if history is not None else None
+        self.edit_menu.entryconfigure(
+            0,
+            label=f"Undo {undo}" if undo else "Undo",
+            state="normal" if undo else "disabled",
+        )
+        self.edit_menu.entryconfigure(
+            1,
+            label=f"Redo {redo}" if redo else "Redo",
+            state="normal" if redo else "disabled",
+        )
+
+    def undo(self) -> None:
+        label = self.controller.undo()
+        if label is not None:
+            self._after_history(f"Undid {label.lower()}")
+
+    def redo(self) -> None:
+        label = self.controller.redo()
+        if label is not None:
+            self._after_history(f"Redid {label.lower()}")
+
+    def _after_history(self, message: str) -> None:
+        # The views update themselves from the controller's changes
+        self.flash_status(message)
+
     def select_category(self, category: str) -> None:
         self.selected_category = category
-        self.refresh_tasks()
+        self.task_area.refresh()
         self.root.title(f"To-Do List - {category}")
 
     def get_selected_category(self) -> str:
         return self.selected_category
 
-    def refresh_categories(self) -> None:
-        self.sidebar.theme = self.theme
-        self.sidebar.refresh()
+    def show_status(self, message: str) -> None:
+        self.status_message = message
+        if self._status_clear is not None:
+            self.root.after_cancel(self._status_clear)
+            self._status_clear = None
+        if not message and self.perf is None:
+            self.status_bar.grid_remove()
+            return
+        self.status_bar.grid(row=1, column=0, columnspan=2, sticky="we")
+        self.status_bar.configure(text=self.status_text())
+
+    def flash_status(self, message: str) -> None:
+        """Show ``message`` for a few seconds."""
+        self.show_status(message)
+        self._status_clear = self.root.after(
+            STATUS_CLEAR_MS, self.show_status, ""
+        )
+
+    def status_text(self) -> str:
+        perf = self.perf
+        if perf is None:
+            return self.status_message
+        memory = self.controller.approx_memory()
+        parts = [
+            perf.describe("refresh_tasks", "tasks"),
+            perf.describe("refresh_categories", "categories"),
+            perf.describe("changes", "updates"),
+            perf.describe("search"),
+            f"view {len(self.task_area.tasks):,}"
+            f" / {self.controller.task_count():,} tasks",
+            "model on disk"
+            if memory is None
+            else f"model ~{format_bytes(memory)}",
+        ]
+        if self.status_message:
+            parts.insert(0, self.status_message)
+        return "  |  ".join(parts)
 
-    def refresh_tasks(self) -> None:
-        tasks = self.controller.get_tasks_by_category(self.selected_category)
-        self.task_area.theme = self.theme
-        self.task_area.refresh(tasks)
+    def update_status(self) -> None:
+        self.status_bar.configure(text=self.status_text())
+        self.root.after(STATUS_INTERVAL_MS, self.update_status)
+
+    def _load_more(self) -> None:
+        more = self.controller.load_step()
+        if more:
+            count = self.controller.task_count()
+            self.show_status(f"Loading tasks... {count:,}")
+            self.root.after(1, self._load_more)
+        else:
+            self.show_status("")
+
+    # --- Import / export ---
+
+    def import_tasks(self) -> None:
+        if self.transferring:
+            return
+        from tkinter import filedialog
+
+        from app.transfer import read_batches
+
+        path = filedialog.askopenfilename(
+            parent=self.root,
+            title="Import Tasks",
+            filetypes=TRANSFER_FILETYPES,
+        )
+        if not path:
+            return
+        self.transferring = True
+        name = Path(path).name
+        self.show_status(f"Importing {name}...")
+        self._read_next_batch(name, read_batches(path), 0)
+
+    def _read_next_batch(
+        self, name: str, batches: "Iterator[list[TaskRecord]]", count: int
+    ) -> None:
+        # Parsing happens on a worker; inserting stays on the Tk thread
+        self.executor.submit(
+            next,
+            batches,
+            None,
+            key="transfer",
+            on_done=lambda batch: self._import_batch(
+                name, batches, count, batch
+            ),
+            on_error=self._transfer_failed,
+        )
+
+    def _import_batch(
+        self,
+        name: str,
+        batches: "Iterator[list[TaskRecord]]",
+        count: int,
+        batch: "list[TaskRecord] | None",
+    ) -> None:
+        if batch is None:
+            self._transfer_done(f"Imported {count:,} tasks from {name}")
+            return
+        # Parse the next chunk while this one is inserted
+        self._read_next_batch(name, batches, count + len(batch))
+        # Chunks after the first join its undo entry
+        self.controller.add_tasks(batch, merge_undo=count > 0)
+        count += len(batch)
+        self.show_status(f"Importing {name}... {count:,} tasks")
+
+    def export_tasks(self) -> None:
+        if self.transferring:
+            return
+        from tkinter import filedialog
+
+        from app.transfer import CHUNK_SIZE, task_record, write_tasks
+
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export Tasks",
+            filetypes=TRANSFER_FILETYPES,
+            defaultextension=".jsonl",
+        )
+        if not path:
+            return
+        self.transferring = True
+        name = Path(path).name
+        total = self.controller.task_count()
+        feed: queue.Queue[list[TaskRecord] | None] = queue.Queue(
+            EXPORT_BUFFER_CHUNKS
+        )
+        job = self.executor.submit(
+            write_tasks,
+            path,
+            iter_feed(feed),
+            report_progress,
+            key="transfer",
+            on_done=lambda count: self._transfer_done(
+                f"Exported {count:,} tasks to {name}"
+            ),
+            on_error=self._transfer_failed,
+            on_progress=lambda done: self.show_status(
+                f"Exporting to {name}... {done:,} / {total:,} tasks"
+            ),
+        )
+        self.show_status(f"Exporting to {name}...")
+        # Tasks are read here, on the Tk thread, and handed to the writer
+        # as plain records one chunk per turn.
+        chunks = (
+            [task_record(t) for t in chunk]
+            for chunk in batched(self.controller.iter_tasks(), CHUNK_SIZE)
+        )
+        feed_job(self.root.after, job, feed, chunks)
+
+    def _transfer_done(self, message: str) -> None:
+        self.transferring = False
+        self.flash_status(message)
+
+    def _transfer_failed(self, error: BaseException) -> None:
+        import csv
+
+        self.transferring = False
+        self.show_status("")
+        if isinstance(error, (OSError, ValueError, KeyError, csv.Error)):
+            messagebox.showerror("Import/Export Error", str(error))
+        else:
+            self.root.report_callback_exception(
+                type(error), error, error.__traceback__
+            )
+
+    def set_busy(self, busy: bool) -> None:
+        if busy:
+            self.busy_indicator.grid(row=1, column=1, sticky="e", padx=6)
+            self.busy_indicator.start(15)
+        else:
+            self.busy_indicator.stop()
+            self.busy_indicator.grid_remove()
+
+    def on_close(self) -> None:
+        self.executor.shutdown()
+        self.autosaver.close()
+        self.controller.changes.schedule = None
+        self.root.destroy()
 
     def switch_theme(self) -> None:
         self.theme_name = "light" if self.theme_name == "dark" else "dark"
         self.theme = THEMES[self.theme_name]
-        self.setup_style()
+        use_theme(self.root, self.theme_name)
+        # Only plain Tk widgets need their colours set; no rows or
+        # category buttons are rebuilt.
         self.root.configure(bg=self.theme["bg"])
-        self.sidebar.theme = self.theme
-        self.task_area.theme = self.theme
-        self.refresh_categories()
-        self.refresh_tasks()
-
-    def fade_in(self) -> None:
-        self.root.attributes("-alpha", 0.0)
-        def _fade(step=0):
-            alpha = min(1.0, step / 10)
-            self.root.attributes("-alpha", alpha)
-            if alpha < 1.0:
-                self.root.after(30, _fade, step + 1)
-        _fade()
\ No newline at end of file
+        self.sidebar.apply_theme(self.theme)
+        self.task_area.apply_theme(self.theme)
@@ -0,0 +1,119 @@
+import tkinter as tk
+from abc import ABC, abstractmethod
+from typing import Any, Self
+
+from .styles import DIALOG_BG, FONT
+
+# Pooled widgets are named children of their owner, so Tk's own child
+# table is the pool: they are found again by name and die with the owner.
+
+
+class Tooltip(tk.Toplevel):
+    """The one tooltip window of a toplevel, moved and relabelled."""
+
+    def __init__(self, top: tk.Misc) -> None:
+        super().__init__(top, name="tooltip")
+        self.withdraw()
+        self.wm_overrideredirect(True)
+        self.label: tk.Label = tk.Label(
+            self,
+            background="#222",
+            foreground="#fff",
+            borderwidth=1,
+            relief="solid",
+            font=(FONT, 9),
+            padx=6,
+            pady=2,
+        )
+        self.label.pack()
+
+    def show(self, widget: tk.Misc, text: str) -> None:
+        x = widget.winfo_rootx() + 30
+        y = widget.winfo_rooty() + 20
+        self.label.configure(text=text)
+        self.wm_geometry(f"+{x}+{y}")
+        self.deiconify()
+        self.lift()
+
+    def hide(self) -> None:
+        self.withdraw()
+
+
+def tooltip(widget: tk.Misc) -> Tooltip:
+    top = widget.winfo_toplevel()
+    existing = top.children.get("tooltip")
+    if isinstance(existing, Tooltip):
+        return existing
+    return Tooltip(top)
+
+
+def add_tooltip(widget: tk.Misc, text: str) -> None:
+    widget.bind("<Enter>", lambda _: tooltip(widget).show(widget, text))
+    widget.bind("<Leave>", lambda _: tooltip(widget).hide())
+    widget.bind("<ButtonPress>", lambda _: tooltip(widget).hide(), add="+")
+
+
+def context_menu(owner: tk.Misc, name: str = "context") -> tk.Menu:
+    """An emptied menu owned by ``owner``, created on first use."""
+    existing = owner.children.get(name)
+    if isinstance(existing, tk.Menu):
+        existing.delete(0, tk.END)
+        return existing
+    return tk.Menu(owner, name=name, tearoff=0)
+
+
+def popup(menu: tk.Menu, event: tk.Event) -> None:
+    try:
+        menu.tk_popup(event.x_root, event.y_root)
+    finally:
+        menu.grab_release()
+
+
+class PooledDialog(tk.Toplevel, ABC):
+    """Modal dialog that is built once per window and withdrawn between uses.
+
+    Subclasses build their widgets in ``__init__`` and put them back into
+    a blank state in ``reset``; ``ask`` returns ``result`` once the dialog
+    is closed.
+    """
+
+    dialog_title: str = ""
+
+    def __init__(self, parent: tk.Misc, name: str) -> None:
+        super().__init__(parent, name=name)
+        self.withdraw()
+        self.title(self.dialog_title)
+        self.resizable(False, False)
+        self.configure(bg=DIALOG_BG)
+        self.result: Any = None
+        self._open: tk.BooleanVar = tk.BooleanVar(self, value=False)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.bind("<Escape>", lambda e: self.close())
+
+    @classmethod
+    def ask(cls: type[Self], parent: tk.Misc, **kwargs: Any) -> Any:
+        top = parent.winfo_toplevel()
+        name = f"pooled_{cls.__name__.lower()}"
+        dialog = top.children.get(name)
+        if not isinstance(dialog, cls):
+            dialog = cls(top, name)
+        dialog.reset(**kwargs)
+        return dialog.run()
+
+    @abstractmethod
+    def reset(self, *args: Any, **kwargs: Any) -> None: ...
+
+    def run(self) -> Any:
+        self.result = None
+        self._open.set(True)
+        self.deiconify()
+        self.lift()
+        self.grab_set()
+        self.wait_variable(self._open)
+        return self.result
+
+    def close(self) -> None:
+        tooltip(self).hide()
+        self.grab_release()
+        self.withdraw()
+        self._open.set(False)
@@ -2,6 +2,12 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from typing import Any, Callable
 
+from app.events import CATEGORY_CHANGES, Change
+from app.models import TaskCounts
+
+from .pool import context_menu, popup
+
+
 class Sidebar(ttk.Frame):
     def __init__(
         self,
@@ -10,7 +16,6 @@ class Sidebar(ttk.Frame):
         icons: dict[str, Any],
         theme: dict[str, Any],
         select_category: Callable[[str], None],
-        refresh_categories: Callable[[], None],
         switch_theme: Callable[[], None],
     ) -> None:
         super().__init__(parent, style="Sidebar.TFrame")
@@ -18,13 +23,20 @@ class Sidebar(ttk.Frame):
         self.icons = icons
         self.theme = theme
         self.select_category = select_category
-        self.refresh_categories = refresh_categories
         self.switch_theme = switch_theme
         self.selected_category = "All"
+        self.cat_canvas: tk.Canvas
         self.cat_frame: ttk.Frame
         self.add_cat_btn: ttk.Button
         self.category_buttons: dict[str, ttk.Button] = {}
+        # Controller version the badges were last drawn for
+        self._counts_version: int | None = None
         self.build()
+        controller.changes.subscribe(self.on_changes)
+
+    def destroy(self) -> None:
+        self.controller.changes.unsubscribe(self.on_changes)
+        super().destroy()
 
     def build(self) -> None:
         # Title
@@ -38,9 +50,39 @@ class Sidebar(ttk.Frame):
         # Separator
         ttk.Separator(self, orient="horizontal").pack(fill=tk.X, padx=8, pady=(0, 8))
 
-        # Category list frame
-        self.cat_frame = ttk.Frame(self, style="Sidebar.TFrame")
-        self.cat_frame.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 8))
+        # Scrollable category list
+        cat_area = ttk.Frame(self, style="Sidebar.TFrame")
+        cat_area.pack(fill=tk.BOTH, expand=True, padx=12, pady=(0, 8))
+        self.cat_canvas = tk.Canvas(
+            cat_area,
+            bg=self.theme["sidebar"],
+            highlightthickness=0,
+            bd=0,
+            width=180,
+        )
+        cat_scroll = ttk.Scrollbar(
+            cat_area, orient="vertical", command=self.cat_canvas.yview
+        )
+        self.cat_canvas.configure(yscrollcommand=cat_scroll.set)
+        cat_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.cat_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.cat_frame = ttk.Frame(self.cat_canvas, style="Sidebar.TFrame")
+        cat_window = self.cat_canvas.create_window(
+            (0, 0), window=self.cat_frame, anchor="nw"
+        )
+        self.cat_frame.bind(
+            "<Configure>",
+            lambda e: self.cat_canvas.configure(
+                scrollregion=self.cat_canvas.bbox("all")
+            ),
+        )
+        self.cat_canvas.bind(
+            "<Configure>",
+            lambda e: self.cat_canvas.itemconfigure(cat_window, width=e.width),
+        )
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.cat_canvas.bind(sequence, self._on_mousewheel)
+            self.cat_frame.bind(sequence, self._on_mousewheel)
 
         # Add Category button
         self.add_cat_btn = ttk.Button(
@@ -69,73 +111,113 @@ class Sidebar(ttk.Frame):
         self.refresh()
 
     def refresh(self) -> None:
-        for widget in self.cat_frame.winfo_children():
-            widget.destroy()
-        self.category_buttons.clear()
-        for cat in self.controller.categories:
-            btn = ttk.Button(
-                self.cat_frame,
-                text=cat.name,
-                image=self.icons["category"],
-                compound=tk.LEFT,
-                style="Accent.TButton" if cat.name != self.selected_category else "SelectedCategory.TButton",
-                command=lambda c=cat.name: self.on_category_click(c),
-                cursor="hand2"
-            )
-            btn.pack(fill=tk.X, pady=3, ipady=2)
-            self.category_buttons[cat.name] = btn
-            if cat.name != "All":
-                btn.bind(
-                    "<Button-3>",
-                    lambda e, c=cat.name: self.show_context_menu(e, c),
-                )
-                btn.bind(
-                    "<Button-2>",
-                    lambda e, c=cat.name: self.show_context_menu(e, c),
-                )  # For macOS
-
-        # Custom style for selected category
-        style = ttk.Style(self)
-        style.configure(
-            "SelectedCategory.TButton",
-            background=self.theme["accent"],
-            foreground=self.theme["button_fg"],
-            font=("Segoe UI Variable", 11, "bold"),
-            borderwidth=0,
-            relief="flat",
-            padding=6,
-        )
-        style.map(
-            "SelectedCategory.TButton",
-            background=[("active", self.theme["accent"])],
-            foreground=[("active", self.theme["button_fg"])]
+        names = [cat.name for cat in self.controller.categories]
+        wanted = set(names)
+        for name in [n for n in self.category_buttons if n not in wanted]:
+            self.category_buttons.pop(name).destroy()
+        for name in names:
+            if name not in self.category_buttons:
+                self.category_buttons[name] = self._create_button(name)
+        if list(self.category_buttons) != names:
+            # Categories were reordered: repack in controller order.
+            for name in names:
+                self.category_buttons[name].pack_forget()
+            for name in names:
+                self.category_buttons[name].pack(fill=tk.X, pady=3, ipady=2)
+            self.category_buttons = {
+                name: self.category_buttons[name] for name in names
+            }
+        self._counts_version = None
+        self.update_counts()
+
+    def on_changes(self, changes: list[Change]) -> None:
+        # Buttons only come and go with categories; badges with any task
+        if any(c.kind in CATEGORY_CHANGES for c in changes):
+            self.refresh()
+        else:
+            self.update_counts()
+
+    def update_counts(self) -> None:
+        """Redraw the completed/total badges if any task changed."""
+        version = self.controller.version
+        if version == self._counts_version:
+            return
+        self._counts_version = version
+        counts = self.controller.category_counts()
+        for name, btn in self.category_buttons.items():
+            text = self._badge_text(name, counts.get(name))
+            if btn.cget("text") != text:
+                btn.configure(text=text)
+
+    @staticmethod
+    def _badge_text(name: str, counts: TaskCounts | None) -> str:
+        if counts is None or not counts.total:
+            return name
+        return f"{name}  {counts.completed}/{counts.total}"
+
+    def _create_button(self, name: str) -> ttk.Button:
+        btn = ttk.Button(
+            self.cat_frame,
+            text=name,
+            image=self.icons["category"],
+            compound=tk.LEFT,
+            style=self._button_style(name),
+            command=lambda c=name: self.on_category_click(c),
+            cursor="hand2"
         )
+        btn.pack(fill=tk.X, pady=3, ipady=2)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            btn.bind(sequence, self._on_mousewheel)
+        if name != "All":
+            btn.bind(
+                "<Button-3>",
+                lambda e, c=name: self.show_context_menu(e, c),
+            )
+            btn.bind(
+                "<Button-2>",
+                lambda e, c=name: self.show_context_menu(e, c),
+            )  # For macOS
+        return btn
+
+    def _button_style(self, name: str) -> str:
+        if name == self.selected_category:
+            return "SelectedCategory.TButton"
+        return "Accent.TButton"
+
+    def apply_theme(self, theme: dict[str, Any]) -> None:
+        # Buttons follow the ttk theme; only the canvas is plain Tk
+        self.theme = theme
+        self.cat_canvas.configure(bg=theme["sidebar"])
 
     def on_category_click(self, category: str) -> None:
+        previous = self.selected_category
         self.selected_category = category
         self.select_category(category)
-        self.refresh()  # Update highlight
+        # Update highlight on just the two affected buttons
+        for name in (previous, category):
+            btn = self.category_buttons.get(name)
+            if btn is not None:
+                btn.configure(style=self._button_style(name))
+
+    def _on_mousewheel(self, event: tk.Event) -> None:
+        if event.num == 4 or event.delta > 0:
+            self.cat_canvas.yview_scroll(-1, "units")
+        elif event.num == 5 or event.delta < 0:
+            self.cat_canvas.yview_scroll(1, "units")
 
     def show_context_menu(self, event: tk.Event, category_name: str) -> None:
-        menu: tk.Menu = tk.Menu(self, tearoff=0)
+        menu: tk.Menu = context_menu(self)
         menu.add_command(
             label="Delete", command=lambda: self.delete_category(category_name)
         )
-        try:
-            menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            menu.grab_release()
+        popup(menu, event)
 
     def add_category_dialog(self) -> None:
         from app.gui.add_category_dialog import AddCategoryDialog
 
-        dialog = AddCategoryDialog(self)
-        self.wait_window(dialog)
-        name = dialog.result
+        name = AddCategoryDialog.ask(self)
         if name:
-            if self.controller.add_category(name):
-                self.refresh_categories()
-            else:
+            if not self.controller.add_category(name):
                 messagebox.showwarning(
                     "Category Error",
                     "Category already exists or name is invalid.",
@@ -145,5 +227,4 @@ class Sidebar(ttk.Frame):
         if messagebox.askyesno(
             "Delete Category", f"Delete category '{name}' and its tasks?"
         ):
-            self.controller.delete_category(name)
-            self.refresh_categories()
\ No newline at end of file
+            self.controller.delete_category(name)
\ No newline at end of file
@@ -0,0 +1,119 @@
+import tkinter as tk
+from tkinter import ttk
+from typing import Any
+
+from app.themes import THEMES
+
+FONT = "Segoe UI Variable"
+
+# Dialogs keep their own dark palette in every theme
+DIALOG_BG = "#23272e"
+
+
+def ttk_theme_name(name: str) -> str:
+    return f"todo-{name}"
+
+
+def theme_settings(theme: dict[str, Any]) -> dict[str, Any]:
+    """Every ttk style the app uses, for one entry of THEMES."""
+    return {
+        "Sidebar.TFrame": {"configure": {"background": theme["sidebar"]}},
+        "Main.TFrame": {"configure": {"background": theme["bg"]}},
+        "TLabel": {
+            "configure": {
+                "background": theme["bg"],
+                "foreground": theme["fg"],
+                "font": (FONT, 12),
+                "padding": 4,
+            }
+        },
+        "Sidebar.TLabel": {
+            "configure": {
+                "background": theme["sidebar"],
+                "foreground": theme["fg"],
+                "font": (FONT, 14, "bold"),
+                "padding": 6,
+            }
+        },
+        "Accent.TButton": {
+            "configure": {
+                "background": theme["button"],
+                "foreground": theme["button_fg"],
+                "font": (FONT, 11, "bold"),
+                "borderwidth": 0,
+                "padding": 6,
+            },
+            "map": {"background": [("active", theme["accent"])]},
+        },
+        "SelectedCategory.TButton": {
+            "configure": {
+                "background": theme["accent"],
+                "foreground": theme["button_fg"],
+                "font": (FONT, 11, "bold"),
+                "borderwidth": 0,
+                "relief": "flat",
+                "padding": 6,
+            },
+            "map": {
+                "background": [("active", theme["accent"])],
+                "foreground": [("active", theme["button_fg"])],
+            },
+        },
+        "TEntry": {
+            "configure": {
+                "fieldbackground": theme["entry_bg"],
+                "foreground": theme["entry_fg"],
+                "padding": 4,
+            }
+        },
+        "Statusbar.TLabel": {
+            "configure": {
+                "background": theme["sidebar"],
+                "foreground": theme["fg"],
+                "font": (FONT, 10),
+                "anchor": "w",
+                "padding": 4,
+            }
+        },
+        "Dialog.TFrame": {"configure": {"background": DIALOG_BG}},
+        "DialogHeader.TLabel": {
+            "configure": {"background": DIALOG_BG, "foreground": "#fff"}
+        },
+        "Dialog.TButton": {
+            "configure": {
+                "background": "#444",
+                "foreground": "#fff",
+                "font": (FONT, 10),
+                "borderwidth": 0,
+                "padding": 6,
+            }
+        },
+        "DialogAccent.TButton": {
+            "configure": {
+                "background": "#3b82f6",
+                "foreground": "#fff",
+                "font": (FONT, 10, "bold"),
+                "borderwidth": 0,
+                "padding": 6,
+            },
+            "map": {"background": [("active", "#2563eb")]},
+        },
+    }
+
+
+def create_themes(root: tk.Misc) -> None:
+    """Register one ttk theme per app theme; a no-op once done."""
+    style = ttk.Style(root)
+    existing = set(style.theme_names())
+    for name, theme in THEMES.items():
+        if ttk_theme_name(name) not in existing:
+            style.theme_create(
+                ttk_theme_name(name),
+                parent="clam",
+                settings=theme_settings(theme),
+            )
+
+
+def use_theme(root: tk.Misc, name: str) -> None:
+    # ttk widgets restyle themselves; plain Tk widgets are the caller's
+    ttk.Style(root).theme_use(ttk_theme_name(name))
@@ -1,8 +1,27 @@
 import tkinter as tk
+from bisect import insort
 from tkinter import messagebox, ttk
 from typing import Any, Callable
 
-from .task_dialog import TaskDialog
+from app.events import TASK_CHANGES, Change
+from app.query import parse_query
+from app.sorted_view import sort_key
+
+from .pool import add_tooltip, context_menu, popup
+from .virtual_list import VirtualListbox
+
+SEARCH_DELAY_MS = 150
+# Larger batches of changes re-run the query instead of patching rows
+PATCH_LIMIT = 100
+# Longer queries filter a result this small in place; bigger results go
+# back to the search index
+NARROW_LIMIT = 2000
+SORT_CHOICES = [
+    ("Default", "id"),
+    ("Title", "title"),
+    ("Completed", "completed"),
+]
+
 
 class TaskArea(ttk.Frame):
     def __init__(
@@ -12,21 +31,33 @@ class TaskArea(ttk.Frame):
         icons: dict[str, Any],
         theme: dict[str, Any],
         get_selected_category: Callable[[], str],
-        refresh_tasks: Callable[[], None],
     ) -> None:
         super().__init__(parent, style="Main.TFrame")
         self.controller = controller
         self.icons = icons
         self.theme = theme
         self.get_selected_category = get_selected_category
-        self.refresh_tasks = refresh_tasks
         self.active_filter = "All"
+        self.active_sort = "id"
         self.tasks: list[Any] = []
+        self._search_job: str | None = None
+        self._search_generation: int = 0
+        # (category, filter, sort, controller version, query) behind
+        # self.tasks
+        self._search_state: tuple[Any, ...] | None = None
         self.search_var: tk.StringVar
+        self.search_entry: ttk.Entry
         self.task_var: tk.StringVar
+        self.task_view: VirtualListbox
         self.task_listbox: tk.Listbox
         self.filter_menu: tk.Menu
+        self.sort_menu: tk.Menu
         self.build()
+        controller.changes.subscribe(self.on_changes)
+
+    def destroy(self) -> None:
+        self.controller.changes.unsubscribe(self.on_changes)
+        super().destroy()
 
     def build(self) -> None:
         button_width = 14
@@ -36,7 +67,7 @@ class TaskArea(ttk.Frame):
         top_frame.pack(fill=tk.X, padx=30, pady=(18, 0))
 
         self.search_var = tk.StringVar()
-        search_entry = ttk.Entry(
+        search_entry = self.search_entry = ttk.Entry(
             top_frame,
             textvariable=self.search_var,
             font=("Segoe UI Variable", 11),
@@ -63,8 +94,24 @@ class TaskArea(ttk.Frame):
             )
         filter_btn["menu"] = self.filter_menu
         filter_btn.grid(row=0, column=1, sticky="ew")
+
+        sort_btn = ttk.Menubutton(
+            top_frame,
+            text="Sort",
+            style="Accent.TButton",
+            direction="below",
+            width=button_width,
+            cursor="hand2"
+        )
+        # Rebuilt on every post so custom fields added since show up
+        self.sort_menu = tk.Menu(
+            sort_btn, tearoff=0, postcommand=self._update_sort_menu
+        )
+        sort_btn["menu"] = self.sort_menu
+        sort_btn.grid(row=0, column=2, sticky="ew", padx=(8, 0))
         top_frame.columnconfigure(0, weight=1)
         top_frame.columnconfigure(1, weight=0)
+        top_frame.columnconfigure(2, weight=0)
 
         # Separator
         ttk.Separator(self, orient="horizontal").pack(fill=tk.X, padx=30, pady=(10, 8))
@@ -82,7 +129,7 @@ class TaskArea(ttk.Frame):
         )
         entry.grid(row=0, column=0, sticky="ew", padx=(0, 8), ipady=6)
         entry.bind("<Return>", lambda e: self.open_add_task_dialog())
-        self._add_tooltip(entry, "Enter a new task and press Enter or click Add Task")
+        add_tooltip(entry, "Enter a new task and press Enter or click Add Task")
 
         add_btn = ttk.Button(
             entry_frame,
@@ -95,7 +142,7 @@ class TaskArea(ttk.Frame):
             cursor="hand2"
         )
         add_btn.grid(row=0, column=1, sticky="ew")
-        self._add_tooltip(add_btn, "Add a new task")
+        add_tooltip(add_btn, "Add a new task")
         entry_frame.columnconfigure(0, weight=1)
         entry_frame.columnconfigure(1, weight=0)
 
@@ -124,7 +171,7 @@ class TaskArea(ttk.Frame):
             cursor="hand2"
         )
         del_btn.grid(row=0, column=1, sticky="e", padx=(0, 0))
-        self._add_tooltip(del_btn, "Delete the selected task")
+        add_tooltip(del_btn, "Delete the selected tasks")
 
         tasks_header.columnconfigure(0, weight=1)
         tasks_header.columnconfigure(1, weight=1)
@@ -135,7 +182,7 @@ class TaskArea(ttk.Frame):
         )
         listbox_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=(8, 18))
 
-        self.task_listbox = tk.Listbox(
+        self.task_view = VirtualListbox(
             listbox_frame,
             font=("Segoe UI Variable", 12),
             bg=self.theme["listbox_bg"],
@@ -143,136 +190,303 @@ class TaskArea(ttk.Frame):
             selectbackground=self.theme["select_bg"],
             selectforeground=self.theme["select_fg"],
             activestyle="none",
+            selectmode=tk.EXTENDED,
             bd=0,
             highlightthickness=0,
             relief=tk.FLAT,
         )
-        self.task_listbox.grid(row=0, column=0, sticky="nsew")
+        self.task_view.grid(row=0, column=0, sticky="nsew")
+        self.task_listbox = self.task_view.listbox
         self.task_listbox.bind("<Button-3>", self.show_task_context_menu)
         self.task_listbox.bind("<Button-2>", self.show_task_context_menu)
         self.task_listbox.bind("<Double-Button-1>", self._on_double_click)
         self.task_listbox.bind("<Return>", self._on_enter_key)
+        self.task_listbox.bind("<Delete>", lambda e: self.delete_selected())
         self.task_listbox.bind("<Motion>", self._on_hover)
         self.task_listbox.bind("<Leave>", self._on_leave)
         self.task_listbox.bind("<FocusIn>", self._on_focus_in)
         self.task_listbox.bind("<FocusOut>", self._on_focus_out)
 
-        scrollbar = ttk.Scrollbar(
-            listbox_frame,
-            orient="vertical",
-            command=self.task_listbox.yview,
-        )
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.task_listbox.config(yscrollcommand=scrollbar.set)
-
         listbox_frame.rowconfigure(0, weight=1)
         listbox_frame.columnconfigure(0, weight=1)
 
-    def refresh(self, tasks: list[Any]) -> None:
-        self.tasks = self.apply_filter_logic(tasks)
-        self.tasks = self.apply_search_logic(self.tasks)
-        self.task_listbox.delete(0, tk.END)
-        for t in self.tasks:
-            display = t.text
-            if getattr(t, "completed", False):
-                display = f"\u2713 {t.text}"
-            self.task_listbox.insert(tk.END, display)
-            if getattr(t, "completed", False):
-                self.task_listbox.itemconfig(
-                    tk.END,
-                    fg=self.theme.get("completed_fg", "#888"),
-                    selectforeground=self.theme.get("completed_fg", "#888"),
+    def apply_theme(self, theme: dict[str, Any]) -> None:
+        """Recolour the plain Tk widgets; rows keep their contents."""
+        self.theme = theme
+        self.task_listbox.configure(
+            bg=theme["listbox_bg"],
+            fg=theme["listbox_fg"],
+            selectbackground=theme["select_bg"],
+            selectforeground=theme["select_fg"],
+        )
+        if self.get_search_text():
+            self.search_entry.configure(foreground=theme["entry_fg"])
+
+    def refresh(self) -> None:
+        category: str = self.get_selected_category()
+        query: str = self.get_search_text()
+        state = self._search_state
+        # Same view as before (e.g. after a mutation): patch the rows in
+        # place so the scroll position and selection survive.
+        same_view = state is not None and (
+            state[0],
+            state[1],
+            state[2],
+            state[4],
+        ) == (category, self.active_filter, self.active_sort, query)
+        parsed = parse_query(query)
+        self.tasks = self.controller.query_tasks(
+            category,
+            self.active_filter,
+            parsed.text,
+            conditions=parsed.conditions,
+            sort=self.active_sort,
+        )
+        self._search_state = (
+            category,
+            self.active_filter,
+            self.active_sort,
+            self.controller.version,
+            query,
+        )
+        self.render(incremental=same_view)
+
+    def on_changes(self, changes: list[Change]) -> None:
+        """Patch the shown tasks for one batch of controller changes.
+
+        The changed tasks are taken out of the list, then each is put back
+        at its sort position if it still belongs to the view. Tasks change
+        in place, so all must be out before the first bisect. Lazy results
+        and large batches are cheaper to query again.
+        """
+        ids = list(
+            dict.fromkeys(c.key for c in changes if c.kind in TASK_CHANGES)
+        )
+        state = self._search_state
+        if not ids or state is None:
+            return
+        if not isinstance(self.tasks, list) or len(ids) > PATCH_LIMIT:
+            self.refresh()
+            return
+        category, status, sort, _, query = state
+        parsed = parse_query(query)
+        text = parsed.text.strip().lower()
+        key = sort_key(sort)
+        changed = set(ids)
+        tasks = [t for t in self.tasks if t.id not in changed]
+        for task_id in ids:
+            task = self.controller.get_task(task_id)
+            if task is None:
+                continue
+            if (
+                (category == "All" or task.category == category)
+                and (
+                    status == "All"
+                    or task.completed == (status == "Completed")
+                )
+                and text in task.text.lower()
+                and all(
+                    c.matches(task.custom_fields) for c in parsed.conditions
                 )
+            ):
+                insort(tasks, task, key=key)
+        self.tasks = tasks
+        self._search_state = (*state[:3], self.controller.version, query)
+        self.render(incremental=True)
+
+    def render(self, incremental: bool = False) -> None:
+        if incremental:
+            self.task_view.update_items(self.tasks)
+        else:
+            self.task_view.set_items(
+                self.tasks, self._render_task, lambda t: t.id
+            )
+
+    def _render_task(self, t: Any) -> tuple[str, dict[str, Any]]:
+        if getattr(t, "completed", False):
+            completed_fg = self.theme.get("completed_fg", "#888")
+            return f"\u2713 {t.text}", {
+                "fg": completed_fg,
+                "selectforeground": completed_fg,
+            }
+        return t.text, {}
 
     def open_add_task_dialog(self) -> None:
         title: str = self.task_var.get().strip()
         if not title:
             messagebox.showwarning("Input Error", "Task name cannot be empty.")  # type: ignore
             return
-        dialog: TaskDialog = TaskDialog(self, title=title)
-        self.wait_window(dialog)
-        if dialog.result:
-            custom_fields: dict[str, Any] = dialog.result
+        from .task_dialog import TaskDialog
+
+        custom_fields: dict[str, Any] | None = TaskDialog.ask(self)
+        if custom_fields:
             category: str = self.get_selected_category()
             self.controller.add_task(title, category, **custom_fields)
             self.task_var.set("")
-            self.refresh_tasks()
 
     def open_edit_task_dialog(self, index: int) -> None:
+        from .task_dialog import TaskDialog
+
         task: Any = self.tasks[index]
-        dialog: TaskDialog = TaskDialog(
-            self,
-            title=task.text,
-            custom_fields=getattr(task, "custom_fields", {}),
+        custom_fields: dict[str, Any] | None = TaskDialog.ask(
+            self, custom_fields=getattr(task, "custom_fields", {})
         )
-        self.wait_window(dialog)
-        if dialog.result:
-            custom_fields: dict[str, Any] = dialog.result
-            category: str = self.get_selected_category()
-            self.controller.edit_task(
-                index, category, task.text, **custom_fields
-            )
-            self.refresh_tasks()
+        if custom_fields:
+            self.controller.edit_task(task.id, task.text, **custom_fields)
 
     def show_task_context_menu(self, event: tk.Event) -> None:
-        index: int = int(self.task_listbox.nearest(event.y))
-        if index < 0 or index >= self.task_listbox.size():
+        index: int = self.task_view.nearest(event.y)
+        if index < 0 or index >= self.task_view.size():
             return
-        self.task_listbox.selection_clear(0, tk.END)
-        self.task_listbox.selection_set(index)
-        task = self.tasks[index]
-        menu: tk.Menu = tk.Menu(self, tearoff=0)
-        menu.add_command(
-            label="Edit", command=lambda: self.open_edit_task_dialog(index)
-        )
-        menu.add_command(
-            label="Complete",
-            command=lambda: self.complete_task(index),
-            state="disabled" if getattr(task, "completed", False) else "normal"
-        )
-        menu.add_command(
-            label="Delete", command=lambda: self.delete_task(index=index)
-        )
-        try:
-            menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            menu.grab_release()
+        if index not in self.task_view.selection:
+            self.task_view.clear_selection()
+            self.task_view.selection_set(index)
+        count = len(self.task_view.selection)
+        menu: tk.Menu = context_menu(self)
+        if count == 1:
+            task = self.tasks[index]
+            menu.add_command(
+                label="Edit",
+                command=lambda: self.open_edit_task_dialog(index),
+            )
+            menu.add_command(
+                label="Complete",
+                command=lambda: self.complete_task(index),
+                state=(
+                    "disabled"
+                    if getattr(task, "completed", False)
+                    else "normal"
+                ),
+            )
+            menu.add_command(
+                label="Delete", command=lambda: self.delete_task(index=index)
+            )
+        else:
+            menu.add_command(
+                label=f"Complete {count} Tasks", command=self.complete_selected
+            )
+            menu.add_command(
+                label=f"Delete {count} Tasks", command=self.delete_selected
+            )
+        move_menu = context_menu(menu, "move")
+        for category in self.controller.categories:
+            if category.name != "All":
+                move_menu.add_command(
+                    label=category.name,
+                    command=lambda c=category.name: self.move_selected(c),
+                )
+        menu.add_cascade(label="Move To", menu=move_menu)
+        popup(menu, event)
 
     def delete_task(self, index: int | None = None) -> None:
         if index is None:
-            selected = self.task_listbox.curselection()
-            if not selected:
-                messagebox.showwarning("Selection Error", "No task selected.")  # type: ignore
-                return
-            index = selected[0]
-        category: str = self.get_selected_category()
-        self.controller.delete_task(index, category)
-        self.refresh_tasks()
+            self.delete_selected()
+            return
+        self.controller.delete_task(self.tasks[index].id)
 
     def complete_task(self, index: int) -> None:
-        category: str = self.get_selected_category()
-        self.controller.complete_task(index, category)
-        self.refresh_tasks()
+        self.controller.complete_task(self.tasks[index].id)
+
+    def selected_ids(self) -> list[int]:
+        return [self.tasks[i].id for i in self.task_view.curselection()]
+
+    # Bulk actions: one controller call, so one batch of changes, for the
+    # whole selection. The selection is dropped first so the update does
+    # not look for rows that are gone.
+
+    def complete_selected(self) -> None:
+        ids = self.selected_ids()
+        self.task_view.clear_selection()
+        self.controller.complete_many(ids)
+
+    def delete_selected(self) -> None:
+        ids = self.selected_ids()
+        if not ids:
+            messagebox.showwarning("Selection Error", "No task selected.")  # type: ignore
+            return
+        self.task_view.clear_selection()
+        if len(ids) == 1:
+            self.controller.delete_task(ids[0])
+        else:
+            self.controller.delete_many(ids)
+
+    def move_selected(self, category: str) -> None:
+        ids = self.selected_ids()
+        self.task_view.clear_selection()
+        self.controller.move_many(ids, category)
 
     def set_filter(self, filter_name: str) -> None:
         self.active_filter = filter_name
-        self.refresh_tasks()
-
-    def apply_filter_logic(self, tasks: list[Any]) -> list[Any]:
-        if self.active_filter == "Completed":
-            return [t for t in tasks if getattr(t, "completed", False)]
-        elif self.active_filter == "Incomplete":
-            return [t for t in tasks if not getattr(t, "completed", False)]
-        return tasks
+        self.refresh()
+
+    def set_sort(self, sort: str) -> None:
+        self.active_sort = sort
+        self.refresh()
+
+    def _update_sort_menu(self) -> None:
+        self.sort_menu.delete(0, tk.END)
+        fields = self.controller.field_names()
+        choices = [*SORT_CHOICES, *((f, f"field:{f}") for f in fields)]
+        for i, (label, sort) in enumerate(choices):
+            if i == len(SORT_CHOICES):
+                self.sort_menu.add_separator()
+            self.sort_menu.add_command(
+                label=f"\u2713 {label}" if sort == self.active_sort else label,
+                command=lambda sort=sort: self.set_sort(sort),
+            )
 
     def apply_search(self) -> None:
-        self.refresh_tasks()
+        # Debounce: only the last keystroke in a burst runs a search.
+        if self._search_job is not None:
+            self.after_cancel(self._search_job)
+        self._search_generation += 1
+        self._search_job = self.after(
+            SEARCH_DELAY_MS, self._run_search, self._search_generation
+        )
 
-    def apply_search_logic(self, tasks: list[Any]) -> list[Any]:
-        search_text: str = self.search_var.get().strip().lower()
-        if search_text and search_text != "search tasks...":
-            return [t for t in tasks if search_text in t.text.lower()]
-        return tasks
+    def _run_search(self, generation: int) -> None:
+        self._search_job = None
+        if generation != self._search_generation:
+            return  # superseded by a newer query
+        query: str = self.get_search_text()
+        state = self._search_state
+        if (
+            state is not None
+            and state[:4]
+            == (
+                self.get_selected_category(),
+                self.active_filter,
+                self.active_sort,
+                self.controller.version,
+            )
+            and isinstance(self.tasks, list)
+        ):
+            if query == state[4]:
+                return
+            old, new = parse_query(state[4]), parse_query(query)
+            text = new.text.lower()
+            if (
+                not old.text
+                or len(self.tasks) > NARROW_LIMIT
+                or old.conditions != new.conditions
+                or not text.startswith(old.text.lower())
+            ):
+                self.refresh()
+                return
+            # Same field conditions and the title text only got longer,
+            # so the matches are a subset of the few already shown.
+            self.tasks = [t for t in self.tasks if text in t.text.lower()]
+            self._search_state = (*state[:4], query)
+            self.render()
+        else:
+            self.refresh()
+
+    def get_search_text(self) -> str:
+        # Field names in queries are case-sensitive, so no lower() here
+        search_text: str = self.search_var.get().strip()
+        if search_text == "Search tasks...":
+            return ""
+        return search_text
 
     # --- UI polish helpers ---
 
@@ -287,19 +501,19 @@ class TaskArea(ttk.Frame):
             entry.config(foreground="#888")
 
     def _on_double_click(self, event):
-        index = self.task_listbox.curselection()
+        index = self.task_view.curselection()
         if index:
             self.open_edit_task_dialog(index[0])
 
     def _on_enter_key(self, event):
-        index = self.task_listbox.curselection()
+        index = self.task_view.curselection()
         if index:
             self.open_edit_task_dialog(index[0])
 
     def _on_hover(self, event):
-        index = self.task_listbox.nearest(event.y)
-        if 0 <= index < self.task_listbox.size():
-            self.task_listbox.activate(index)
+        index = self.task_view.nearest(event.y)
+        if 0 <= index < self.task_view.size():
+            self.task_view.activate(index)
 
     def _on_leave(self, event):
         self.task_listbox.activate(-1)
@@ -309,37 +523,3 @@ class TaskArea(ttk.Frame):
 
     def _on_focus_out(self, event):
         self.task_listbox.config(highlightthickness=0)
-
-    def _add_tooltip(self, widget, text):
-        # Simple tooltip for accessibility
-        def on_enter(_):
-            self._show_tooltip(widget, text)
-        def on_leave(_):
-            self._hide_tooltip()
-        widget.bind("<Enter>", on_enter)
-        widget.bind("<Leave>", on_leave)
-
-    def _show_tooltip(self, widget, text):
-        x, y, _, _ = widget.bbox("insert") if hasattr(widget, "bbox") else (0, 0, 0, 0)
-        x += widget.winfo_rootx() + 30
-        y += widget.winfo_rooty() + 20
-        self._tooltip = tk.Toplevel(widget)
-        self._tooltip.wm_overrideredirect(True)
-        self._tooltip.wm_geometry(f"+{x}+{y}")
-        label = tk.Label(
-            self._tooltip,
-            text=text,
-            background="#222",
-            foreground="#fff",
-            borderwidth=1,
-            relief="solid",
-            font=("Segoe UI Variable", 9),
-            padx=6,
-            pady=2,
-        )
-        label.pack()
-
-    def _hide_tooltip(self):
-        if hasattr(self, "_tooltip") and self._tooltip:
-            self._tooltip.destroy()
-            self._tooltip = None
\ No newline at end of file
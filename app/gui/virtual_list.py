@@ -0,0 +1,348 @@
+import tkinter as tk
+from collections.abc import Callable, Hashable, Sequence
+from difflib import SequenceMatcher
+from tkinter import font as tkfont
+from tkinter import ttk
+from typing import Any
+
+# Event.state modifier bits
+SHIFT = 0x1
+CONTROL = 0x4
+
+RenderItem = Callable[[Any], tuple[str, dict[str, Any]]]
+KeyItem = Callable[[Any], Hashable]
+Row = tuple[Hashable, str, tuple[tuple[str, Any], ...]]
+
+
+def _render_default(item: Any) -> tuple[str, dict[str, Any]]:
+    return str(item), {}
+
+
+class VirtualListbox(ttk.Frame):
+    """A Listbox that only materializes the rows currently on screen.
+
+    ``items`` can be any sequence; only a window of rows around the
+    viewport (plus ``overscan`` rows on each side) is inserted into the
+    underlying ``tk.Listbox``. The scrollbar is driven from the logical
+    row count, and every index taken or returned by the public methods
+    is a logical index into ``items``.
+
+    ``update_items`` swaps in a new sequence while keeping the scroll
+    position and selection, applying only the row inserts and deletes
+    needed to turn the rendered window into the new one.
+
+    With ``selectmode="extended"`` the selection may span rows that are
+    not materialized: shift-click selects the logical range from the
+    last clicked row and Ctrl+A selects every item.
+    """
+
+    def __init__(
+        self, parent: Any, overscan: int = 20, **listbox_options: Any
+    ) -> None:
+        super().__init__(parent, style="Main.TFrame")
+        self.overscan: int = overscan
+        self.items: Sequence[Any] = ()
+        self.render_item: RenderItem = _render_default
+        self.key_item: KeyItem = id
+        self.first: int = 0
+        self.selection: set[int] = set()
+        self._anchor: int | None = None
+        self._start: int = 0
+        self._end: int = 0
+        self._rows: int = 1
+        self._pending: str | None = None
+        self._line_height: int = 0
+        # What is currently inserted in the Listbox, one entry per row
+        self._rendered: list[Row] = []
+
+        self.listbox: tk.Listbox = tk.Listbox(self, **listbox_options)
+        self.listbox.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar: ttk.Scrollbar = ttk.Scrollbar(
+            self, orient="vertical", command=self._on_scrollbar
+        )
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.listbox.config(yscrollcommand=self._on_listbox_scroll)
+        self.listbox.bind("<<ListboxSelect>>", self._on_select, add="+")
+        self.listbox.bind("<Configure>", self._on_configure, add="+")
+        self.listbox.bind("<Control-Home>", lambda e: self._jump(0))
+        self.listbox.bind("<Control-End>", lambda e: self._jump(-1))
+        self.listbox.bind("<ButtonPress-1>", self._on_press, add="+")
+        self.listbox.bind("<Control-a>", self._on_select_all)
+        self.listbox.bind("<<SelectAll>>", self._on_select_all)
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+    # --- Public API (logical indices) ---
+
+    def set_items(
+        self,
+        items: Sequence[Any],
+        render_item: RenderItem | None = None,
+        key_item: KeyItem | None = None,
+    ) -> None:
+        self.items = items
+        if render_item is not None:
+            self.render_item = render_item
+        if key_item is not None:
+            self.key_item = key_item
+        self.first = 0
+        self.selection.clear()
+        self._anchor = None
+        self._materialize()
+
+    def update_items(self, items: Sequence[Any]) -> None:
+        old_items = self.items
+        anchor = (
+            self._find(self.key_item(old_items[self.first]), self.first, items)
+            if self.first < len(old_items)
+            else None
+        )
+        selected = {
+            self._find(self.key_item(old_items[i]), i, items)
+            for i in self.selection
+            if i < len(old_items)
+        }
+        self.items = items
+        self.selection = {i for i in selected if i is not None}
+        self.first = self.first if anchor is None else anchor
+        self._rows = self._visible_rows()
+        self.first = max(0, min(self.first, len(items) - self._rows))
+        start, end = self._window()
+        rows = [self._row(i) for i in range(start, end)]
+        self._apply_diff(rows)
+        self._start, self._end = start, end
+        self.listbox.selection_clear(0, tk.END)
+        for i in self.selection:
+            if start <= i < end:
+                self.listbox.selection_set(i - start)
+        self.listbox.yview(self.first - start)
+        self._update_scrollbar()
+
+    def size(self) -> int:
+        return len(self.items)
+
+    def nearest(self, y: int) -> int:
+        if not self.items:
+            return -1
+        return self._start + int(self.listbox.nearest(y))
+
+    def curselection(self) -> tuple[int, ...]:
+        return tuple(sorted(self.selection))
+
+    def clear_selection(self) -> None:
+        self.selection.clear()
+        self.listbox.selection_clear(0, tk.END)
+
+    def select_all(self) -> None:
+        self.selection = set(range(len(self.items)))
+        self.listbox.selection_set(0, tk.END)
+
+    def selection_set(self, index: int) -> None:
+        self.selection.add(index)
+        if self._start <= index < self._end:
+            self.listbox.selection_set(index - self._start)
+
+    def activate(self, index: int) -> None:
+        if self._start <= index < self._end:
+            self.listbox.activate(index - self._start)
+
+    def see(self, index: int) -> None:
+        if index < self.first:
+            self.scroll_to(index)
+        elif index >= self.first + self._rows:
+            self.scroll_to(index - self._rows + 1)
+
+    def scroll_to(self, first: int) -> None:
+        first = max(0, min(first, len(self.items) - self._rows))
+        if self._start <= first and first + self._rows <= self._end:
+            # Still inside the materialized window: just move the view.
+            self.first = first
+            self.listbox.yview(first - self._start)
+            self._update_scrollbar()
+        else:
+            self.first = first
+            self._materialize()
+
+    # --- Window management ---
+
+    def _visible_rows(self) -> int:
+        height = self.listbox.winfo_height()
+        if height <= 1:
+            return 40  # not mapped yet; assume a typical window
+        if not self._line_height:
+            font = tkfont.Font(font=self.listbox.cget("font"))
+            border = int(self.listbox.cget("selectborderwidth"))
+            self._line_height = max(
+                1, font.metrics("linespace") + 2 * border
+            )
+        return max(1, height // self._line_height)
+
+    def _materialize(self) -> None:
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+            self._pending = None
+        lb = self.listbox
+        self._rows = self._visible_rows()
+        self.first = max(0, min(self.first, len(self.items) - self._rows))
+        start, end = self._window()
+        active = self._start + int(lb.index(tk.ACTIVE))
+        lb.delete(0, tk.END)
+        self._rendered = []
+        for i in range(start, end):
+            row = self._row(i)
+            self._insert_row(len(self._rendered), row)
+            self._rendered.append(row)
+        self._start, self._end = start, end
+        for i in self.selection:
+            if start <= i < end:
+                lb.selection_set(i - start)
+        if start <= active < end:
+            lb.activate(active - start)
+        lb.yview(self.first - start)
+        self._update_scrollbar()
+
+    def _window(self) -> tuple[int, int]:
+        start = max(0, self.first - self.overscan)
+        end = min(len(self.items), self.first + self._rows + self.overscan)
+        return start, end
+
+    def _row(self, index: int) -> Row:
+        item = self.items[index]
+        text, options = self.render_item(item)
+        return self.key_item(item), text, tuple(sorted(options.items()))
+
+    def _insert_row(self, position: int, row: Row) -> None:
+        self.listbox.insert(position, row[1])
+        if row[2]:
+            self.listbox.itemconfig(position, **dict(row[2]))
+
+    def _apply_diff(self, rows: list[Row]) -> None:
+        old = self._rendered
+        matcher = SequenceMatcher(None, old, rows, autojunk=False)
+        # Walk backwards so earlier row positions stay valid.
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag == "equal":
+                continue
+            if i2 > i1:
+                self.listbox.delete(i1, i2 - 1)
+            for offset, row in enumerate(rows[j1:j2]):
+                self._insert_row(i1 + offset, row)
+        self._rendered = rows
+
+    def _find(
+        self, key: Hashable, near: int, items: Sequence[Any]
+    ) -> int | None:
+        """Index of ``key`` in ``items`` within a window around ``near``.
+
+        Mutations shift rows by a few places at most, so a bounded local
+        search avoids touching (or, for lazy sequences, loading) the rest.
+        """
+        count = len(items)
+        reach = self._rows + 2 * self.overscan
+        for distance in range(reach + 1):
+            for i in (near - distance, near + distance):
+                if 0 <= i < count and self.key_item(items[i]) == key:
+                    return i
+        return None
+
+    def _update_scrollbar(self) -> None:
+        count = len(self.items)
+        if count <= self._rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(
+                self.first / count, (self.first + self._rows) / count
+            )
+
+    def _needs_window(self) -> bool:
+        margin = self.overscan // 2
+        return (self.first - self._start < margin and self._start > 0) or (
+            self._end - (self.first + self._rows) < margin
+            and self._end < len(self.items)
+        )
+
+    def _jump(self, index: int) -> str:
+        if not self.items:
+            return "break"
+        index %= len(self.items)
+        self.see(index)
+        self.clear_selection()
+        self.selection_set(index)
+        self._anchor = index
+        self.activate(index)
+        self.listbox.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    # --- Tk callbacks ---
+
+    def _on_scrollbar(self, *args: str) -> None:
+        count = len(self.items)
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * count))
+        elif args[0] == "scroll":
+            step = self._rows if args[2] == "pages" else 1
+            self.scroll_to(self.first + int(args[1]) * step)
+
+    def _on_listbox_scroll(self, lo: float | str, hi: float | str) -> None:
+        # The Listbox scrolled itself (wheel, keyboard, drag-select):
+        # follow it and slide the window before it runs out of rows.
+        if self._end > self._start:
+            self.first = self._start + int(self.listbox.index("@0,0"))
+        self._update_scrollbar()
+        if self._needs_window() and self._pending is None:
+            self._pending = self.after_idle(self._slide)
+
+    def _slide(self) -> None:
+        self._pending = None
+        self._materialize()
+
+    def _on_select(self, event: tk.Event) -> None:
+        outside = {
+            i for i in self.selection if not self._start <= i < self._end
+        }
+        inside = {self._start + int(r) for r in self.listbox.curselection()}
+        if inside and str(self.listbox.cget("selectmode")) in (
+            "browse",
+            "single",
+        ):
+            outside.clear()
+        self.selection = outside | inside
+
+    def _extended(self) -> bool:
+        return str(self.listbox.cget("selectmode")) == tk.EXTENDED
+
+    def _on_press(self, event: tk.Event) -> str | None:
+        if not self._extended():
+            return None
+        index = self.nearest(event.y)
+        if index < 0:
+            return None
+        # Tk hands over the state as a string for some event types
+        state = event.state if isinstance(event.state, int) else 0
+        if state & SHIFT and self._anchor is not None:
+            lo, hi = sorted((self._anchor, index))
+            self.selection = set(range(lo, hi + 1))
+            self.listbox.selection_clear(0, tk.END)
+            first, last = max(lo, self._start), min(hi + 1, self._end)
+            if first < last:
+                self.listbox.selection_set(
+                    first - self._start, last - 1 - self._start
+                )
+            self.listbox.event_generate("<<ListboxSelect>>")
+            return "break"
+        if not state & CONTROL:
+            # Tk only clears the rows it has; drop the off-screen ones
+            self.selection.clear()
+        self._anchor = index
+        return None
+
+    def _on_select_all(self, event: tk.Event) -> str | None:
+        if not self._extended():
+            return None
+        self.select_all()
+        self.listbox.event_generate("<<ListboxSelect>>")
+        return "break"
+
+    def _on_configure(self, event: tk.Event) -> None:
+        if self._visible_rows() != self._rows:
+            self._materialize()
@@ -0,0 +1,144 @@
+import sys
+from collections import deque
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from app.models import Task
+
+# A task's full state, as stored by delete operations:
+# (id, text, category, custom_fields, completed)
+TaskState = tuple[int, str, str | None, Mapping[str, object], bool]
+
+# One inverse operation. Each kind only carries what the mutation changed:
+#   ("edit", task_id, text, custom_fields)
+#   ("move", task_id, category)
+#   ("complete", task_id, completed)
+#   ("delete", task_ids)          remove tasks again
+#   ("restore", task_states)      put removed tasks back with their ids
+#   ("category+", name, position)
+#   ("category-", name)
+Op = tuple[Any, ...]
+ApplyOps = Callable[[list[Op]], list[Op]]
+
+MAX_DEPTH = 200
+MAX_BYTES = 64 * 1024 * 1024
+
+
+def task_state(task: Task) -> TaskState:
+    return (
+        task.id,
+        task.text,
+        task.category,
+        task.custom_fields,
+        task.completed,
+    )
+
+
+class HistoryEntry:
+    __slots__ = ("label", "ops", "size")
+
+    def __init__(self, label: str, ops: list[Op]) -> None:
+        self.label: str = label
+        self.ops: list[Op] = ops
+        self.size: int = _ops_size(ops)
+
+
+class History:
+    """Undo and redo stacks of inverse operations.
+
+    A controller records, for every mutation, the operations that undo
+    it. Undoing applies them through the controller, which returns the
+    operations that redo them again. The undo stack is capped by entry
+    count and by the approximate bytes its entries hold; the oldest
+    entries are dropped first.
+    """
+
+    def __init__(
+        self, max_depth: int = MAX_DEPTH, max_bytes: int = MAX_BYTES
+    ) -> None:
+        self.max_depth: int = max_depth
+        self.max_bytes: int = max_bytes
+        self._undo: deque[HistoryEntry] = deque()
+        self._redo: list[HistoryEntry] = []
+        self._bytes: int = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def undo_label(self) -> str | None:
+        return self._undo[-1].label if self._undo else None
+
+    @property
+    def redo_label(self) -> str | None:
+        return self._redo[-1].label if self._redo else None
+
+    def record(self, label: str, ops: list[Op], merge: bool = False) -> None:
+        """Push the inverse ``ops`` of a mutation.
+
+        With ``merge``, they join the last entry if it has the same
+        label, so work applied in steps (an import read in chunks) is
+        undone in one. The new ops go first: later steps undo first.
+        """
+        self._redo.clear()
+        if merge and self._undo and self._undo[-1].label == label:
+            last = self._undo.pop()
+            self._bytes -= last.size
+            ops = ops + last.ops
+        self._push(HistoryEntry(label, ops))
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def undo(self, apply: ApplyOps) -> str | None:
+        """Undo the last entry; returns its label, or None if empty."""
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._bytes -= entry.size
+        self._redo.append(HistoryEntry(entry.label, apply(entry.ops)))
+        return entry.label
+
+    def redo(self, apply: ApplyOps) -> str | None:
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._push(HistoryEntry(entry.label, apply(entry.ops)))
+        return entry.label
+
+    def approx_bytes(self) -> int:
+        return self._bytes + sum(e.size for e in self._redo)
+
+    def _push(self, entry: HistoryEntry) -> None:
+        self._undo.append(entry)
+        self._bytes += entry.size
+        while len(self._undo) > self.max_depth or (
+            self._bytes > self.max_bytes and len(self._undo) > 1
+        ):
+            self._bytes -= self._undo.popleft().size
+        if self._bytes > self.max_bytes:
+            # A single entry larger than the whole budget is not kept.
+            self.clear()
+
+
+def _ops_size(ops: list[Op]) -> int:
+    size = sys.getsizeof(ops)
+    for op in ops:
+        size += sys.getsizeof(op)
+        if op[0] == "restore":
+            size += sum(
+                96 + sys.getsizeof(state[1]) + 64 * len(state[3])
+                for state in op[1]
+            )
+        elif op[0] == "delete":
+            size += 32 * len(op[1])
+        elif op[0] == "edit":
+            size += sys.getsizeof(op[2]) + 64 * len(op[3])
+    return size
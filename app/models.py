@@ -1,17 +1,55 @@
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
+# Shared by every task without custom fields instead of one dict each
+NO_FIELDS: Mapping[str, object] = MappingProxyType({})
+
+
+def intern_name(name: str | None) -> str | None:
+    return sys.intern(name) if name is not None else None
+
+
+def compact_fields(
+    fields: Mapping[str, object] | None,
+) -> Mapping[str, object]:
+    if not fields:
+        return NO_FIELDS
+    return {sys.intern(k): v for k, v in fields.items()}
+
+
 class Category:
+    __slots__ = ("name",)
+
     def __init__(self, name: str) -> None:
         self.name: str = name
 
 
 class Task:
+    __slots__ = ("id", "text", "category", "custom_fields", "completed")
+
     def __init__(
         self,
         text: str,
         category: str | None = None,
-        custom_fields: dict[str, object] | None = None,
+        custom_fields: Mapping[str, object] | None = None,
         completed: bool = False,
+        task_id: int = 0,
     ) -> None:
+        self.id: int = task_id
         self.text: str = text
-        self.category: str | None = category
-        self.custom_fields: dict[str, object] = custom_fields or {}
+        self.category: str | None = intern_name(category)
+        self.custom_fields: Mapping[str, object] = compact_fields(
+            custom_fields
+        )
         self.completed: bool = completed
+
+
+class TaskCounts(NamedTuple):
+    total: int
+    completed: int
+
+    @property
+    def open(self) -> int:
+        return self.total - self.completed
@@ -0,0 +1,90 @@
+import functools
+import sys
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from itertools import islice
+from typing import Any
+
+
+class PerfMonitor:
+    """Rolling timings for a few named UI operations.
+
+    Methods are timed by replacing them on a specific instance with
+    ``instrument``, so when the monitor is not used nothing is wrapped
+    and the hot paths pay nothing.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window: int = window
+        self.samples: dict[str, deque[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def instrument(
+        self, obj: Any, method: str, name: str | None = None
+    ) -> None:
+        func: Callable[..., Any] = getattr(obj, method)
+        label = name or method
+        record = self.record
+        perf_counter = time.perf_counter
+
+        @functools.wraps(func)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, perf_counter() - start)
+
+        setattr(obj, method, timed)
+
+    def last(self, name: str) -> float | None:
+        samples = self.samples.get(name)
+        return samples[-1] if samples else None
+
+    def p95(self, name: str) -> float | None:
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def describe(self, name: str, label: str | None = None) -> str:
+        last, p95 = self.last(name), self.p95(name)
+        if last is None or p95 is None:
+            return f"{label or name} -"
+        return f"{label or name} {last * 1000:.1f}/{p95 * 1000:.1f} ms"
+
+
+def approx_size(objects: Iterable[Any], count: int, sample: int = 256) -> int:
+    """Estimate the total size of ``count`` objects from a sample."""
+    sizes = [_deep_size(o) for o in islice(objects, sample)]
+    if not sizes:
+        return 0
+    return sum(sizes) * count // len(sizes)
+
+
+def _deep_size(obj: Any) -> int:
+    size = sys.getsizeof(obj)
+    slots = getattr(type(obj), "__slots__", ())
+    for name in slots:
+        value = getattr(obj, name, None)
+        if isinstance(value, (str, dict, set)):
+            size += sys.getsizeof(value)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(v) for v in obj.values())
+    return size
+
+
+def format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if value < 1024:
+            return f"{value:.0f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB"
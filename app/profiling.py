@@ -0,0 +1,166 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tkinter
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def describe_callback(func: Any) -> str:
+    """Readable name for a Tk callback, with its source location."""
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__qualname__", None) or getattr(
+        func, "__name__", repr(func)
+    )
+    if owner is not None:
+        name = f"{type(owner).__name__}.{getattr(func, '__name__', name)}"
+    elif name.endswith("<locals>.callit"):
+        # Misc.after wraps callbacks in callit() but keeps their __name__
+        name = f"after: {func.__name__}"
+    code = getattr(func, "__code__", None)
+    if code is not None and name.endswith("<lambda>"):
+        name += f" ({Path(code.co_filename).name}:{code.co_firstlineno})"
+    return name
+
+
+class _CallbackStats:
+    __slots__ = ("calls", "total", "worst")
+
+    def __init__(self) -> None:
+        self.calls: int = 0
+        self.total: float = 0.0
+        self.worst: float = 0.0
+
+
+class CallbackProfiler:
+    """Profile every Python callback dispatched by Tk.
+
+    ``install`` swaps ``tkinter.CallWrapper``, which Tk uses for button
+    commands, event bindings and ``after`` callbacks alike, for a subclass
+    that runs each top-level callback under one shared cProfile.Profile.
+    Callbacks slower than ``budget_ms`` are logged as they happen, and
+    ``write_stats`` saves everything to ``output_dir`` for offline use:
+
+    - callbacks.prof: cProfile data, for pstats or snakeviz
+    - callbacks.txt: top functions plus per-callback latency
+    - slow_callbacks.log: every callback that went over budget
+    - memory.txt: top allocation sites (with ``trace_memory``)
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        budget_ms: float = 50.0,
+        trace_memory: bool = False,
+    ) -> None:
+        self.output_dir: Path = Path(output_dir)
+        self.budget: float = budget_ms / 1000
+        self.trace_memory: bool = trace_memory
+        self.profile: cProfile.Profile = cProfile.Profile()
+        self.stats: dict[str, _CallbackStats] = {}
+        self._depth: int = 0
+        self._original: type[tkinter.CallWrapper] | None = None
+        self._log_handler: logging.Handler | None = None
+
+    def install(self) -> None:
+        if self._original is not None:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._log_handler = logging.FileHandler(
+            self.output_dir / "slow_callbacks.log", encoding="utf-8"
+        )
+        self._log_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(message)s")
+        )
+        logger.addHandler(self._log_handler)
+        logger.setLevel(logging.INFO)
+        if self.trace_memory:
+            tracemalloc.start(10)
+        self._original = tkinter.CallWrapper
+        profiler = self
+
+        class ProfiledCallWrapper(tkinter.CallWrapper):
+            def __call__(self, *args: Any) -> Any:
+                func = getattr(self, "func", None)
+                return profiler.dispatch(func, super().__call__, *args)
+
+        tkinter.CallWrapper = ProfiledCallWrapper  # type: ignore[misc]
+
+    def uninstall(self) -> None:
+        if self._original is not None:
+            tkinter.CallWrapper = self._original  # type: ignore[misc]
+            self._original = None
+        if self._log_handler is not None:
+            logger.removeHandler(self._log_handler)
+            self._log_handler.close()
+            self._log_handler = None
+
+    def dispatch(self, func: Any, call: Any, *args: Any) -> Any:
+        if self._depth:
+            # Nested event loop (e.g. wait_window in a dialog): the outer
+            # callback is already being profiled.
+            return call(*args)
+        self._depth += 1
+        memory_before = (
+            tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+        )
+        start = time.perf_counter()
+        self.profile.enable()
+        try:
+            return call(*args)
+        finally:
+            self.profile.disable()
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            self._record(func, elapsed, memory_before)
+
+    def _record(self, func: Any, elapsed: float, memory_before: int) -> None:
+        name = describe_callback(func)
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = _CallbackStats()
+        stats.calls += 1
+        stats.total += elapsed
+        stats.worst = max(stats.worst, elapsed)
+        if elapsed > self.budget:
+            message = f"slow callback {name}: {elapsed * 1000:.1f} ms"
+            if self.trace_memory:
+                delta = tracemalloc.get_traced_memory()[0] - memory_before
+                message += f", {delta / 1024:+.0f} KiB allocated"
+            logger.warning(message)
+
+    def write_stats(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.profile.dump_stats(self.output_dir / "callbacks.prof")
+        report = io.StringIO()
+        report.write("Callback latency (worst first)\n")
+        report.write(f"{'callback':<60}{'calls':>8}{'mean ms':>10}")
+        report.write(f"{'worst ms':>10}\n")
+        for name, stats in sorted(
+            self.stats.items(), key=lambda item: item[1].worst, reverse=True
+        ):
+            report.write(
+                f"{name[:59]:<60}{stats.calls:>8}"
+                f"{stats.total / stats.calls * 1000:>10.2f}"
+                f"{stats.worst * 1000:>10.2f}\n"
+            )
+        report.write("\nProfile (cumulative time)\n")
+        if self.stats:
+            pstats.Stats(self.profile, stream=report).sort_stats(
+                "cumulative"
+            ).print_stats(50)
+        (self.output_dir / "callbacks.txt").write_text(
+            report.getvalue(), encoding="utf-8"
+        )
+        if self.trace_memory and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            lines = [str(stat) for stat in snapshot.statistics("lineno")[:50]]
+            (self.output_dir / "memory.txt").write_text(
+                "\n".join(lines) + "\n", encoding="utf-8"
+            )
+            tracemalloc.stop()
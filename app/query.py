@@ -0,0 +1,79 @@
+import re
+import shlex
+from collections.abc import Mapping
+from typing import Any, NamedTuple
+
+# key:value, key=value, key!=value, key<value, key<=value, key>value,
+# key>=value; anything else in the search box is title text.
+_TERM = re.compile(
+    r"^(?P<key>[^\s:<>=!]+)(?P<op>:|!=|<=|>=|=|<|>)(?P<value>.+)$"
+)
+_NUMBER = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)$")
+
+# Normalized field value: numbers sort before text, and text compares
+# case-insensitively. ISO dates (2026-11-01) order correctly as text.
+FieldKey = tuple[int, Any]
+
+
+def field_key(value: object) -> FieldKey:
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    text = str(value).strip()
+    if _NUMBER.match(text):
+        return (0, float(text))
+    return (1, text.lower())
+
+
+class Condition(NamedTuple):
+    key: str
+    op: str
+    value: str
+
+    def matches(self, fields: Mapping[str, object]) -> bool:
+        if self.key not in fields:
+            return self.op == "!="
+        have, want = field_key(fields[self.key]), field_key(self.value)
+        if self.op == "=":
+            return have == want
+        if self.op == "!=":
+            return have != want
+        if have[0] != want[0]:
+            return False  # numbers and text are not ordered together
+        if self.op == "<":
+            return have < want
+        if self.op == "<=":
+            return have <= want
+        if self.op == ">":
+            return have > want
+        return have >= want
+
+
+class Query(NamedTuple):
+    text: str
+    conditions: tuple[Condition, ...]
+
+
+def parse_query(source: str) -> Query:
+    """Split search box input into field conditions and title text.
+
+    Values may be quoted: ``owner:"alice smith"``.
+    """
+    try:
+        words = shlex.split(source)
+    except ValueError:  # unbalanced quotes
+        words = source.split()
+    text: list[str] = []
+    conditions: list[Condition] = []
+    for word in words:
+        match = _TERM.match(word)
+        if match is None:
+            text.append(word)
+        else:
+            conditions.append(
+                Condition(
+                    match["key"],
+                    "=" if match["op"] == ":" else match["op"],
+                    match["value"],
+                )
+            )
+    return Query(" ".join(text), tuple(conditions))
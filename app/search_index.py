@@ -0,0 +1,98 @@
+import re
+import sys
+from collections.abc import Collection
+
+from app.perf import approx_size
+from app.task_store import TaskStore
+
+GRAM_SIZE = 3
+_WORD = re.compile(r"\w+")
+
+
+class SearchIndex:
+    """Incremental inverted index for case-insensitive substring search.
+
+    Each task's words are broken into trigrams that map to the ids
+    containing them. A query only visits the postings of its own trigrams
+    and then confirms the exact substring on those candidates, so results
+    always match ``query in text.lower()``. Titles are not copied: they
+    are read back from the task store, so callers pass the old title when
+    a task is removed or edited. Queries too short to contain a trigram
+    fall back to scanning the store.
+    """
+
+    def __init__(self, store: TaskStore) -> None:
+        self._store: TaskStore = store
+        self._postings: dict[str, set[int]] = {}
+
+    def add(self, task_id: int, text: str) -> None:
+        postings = self._postings
+        for gram in self._grams(text.lower()):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = {task_id}
+            else:
+                posting.add(task_id)
+
+    def remove(self, task_id: int, text: str) -> None:
+        for gram in self._grams(text.lower()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(task_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def update(self, task_id: int, old: str, new: str) -> None:
+        if old.lower() == new.lower():
+            return
+        self.remove(task_id, old)
+        self.add(task_id, new)
+
+    def search(
+        self, query: str, within: Collection[int] | None = None
+    ) -> set[int]:
+        """Ids whose text contains ``query``, optionally among ``within``.
+
+        When ``within`` is smaller than the best posting list it is
+        checked directly instead.
+        """
+        query = query.lower()
+        text_of = self._store.text
+
+        def contains(task_id: int) -> bool:
+            text = text_of(task_id)
+            return text is not None and query in text.lower()
+
+        postings: list[set[int]] = []
+        for gram in self._grams(query):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        if not postings or (
+            within is not None and len(within) <= len(postings[0])
+        ):
+            pool = self._store.ids() if within is None else within
+            return set(filter(contains, pool))
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(candidates) < 32:
+                break
+            candidates &= posting
+        if within is not None:
+            candidates = {i for i in candidates if i in within}
+        return set(filter(contains, candidates))
+
+    def approx_bytes(self) -> int:
+        return sys.getsizeof(self._postings) + approx_size(
+            self._postings.values(), len(self._postings)
+        )
+
+    @staticmethod
+    def _grams(lower: str) -> set[str]:
+        return {
+            token[i : i + GRAM_SIZE]
+            for token in _WORD.findall(lower)
+            for i in range(len(token) - GRAM_SIZE + 1)
+        }
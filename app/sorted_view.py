@@ -0,0 +1,133 @@
+import sys
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from app.models import Task
+from app.perf import approx_size
+from app.query import field_key
+
+# Sort specs understood by query_tasks: "id" (creation order), "title",
+# "completed" (open tasks first) and "field:<key>" (tasks without the
+# field last).
+SortKey = tuple[Any, ...]
+
+
+def sort_key(spec: str) -> Callable[[Task], SortKey]:
+    """Key function for a sort spec; ties are broken by id."""
+    if spec == "id":
+        return lambda task: (task.id,)
+    if spec == "title":
+        return lambda task: (task.text.lower(), task.id)
+    if spec == "completed":
+        return lambda task: (task.completed, task.id)
+    if spec.startswith("field:") and len(spec) > 6:
+        name = spec[6:]
+
+        def key(task: Task) -> SortKey:
+            if name not in task.custom_fields:
+                return (1, 0, 0, task.id)
+            return (0, *field_key(task.custom_fields[name]), task.id)
+
+        return key
+    raise ValueError(f"Unknown sort: {spec!r}")
+
+
+class SortedKeyList:
+    """Sorted list split into buckets of roughly ``load`` keys.
+
+    Finding a key is a bisect over the bucket maxima and then within one
+    bucket, and an insert or delete only shifts that bucket, so both stay
+    close to O(log n) for the list sizes this app deals with.
+    """
+
+    def __init__(self, keys: Iterable[Any] = (), load: int = 1000) -> None:
+        self.load: int = load
+        ordered = sorted(keys)
+        self._buckets: list[list[Any]] = [
+            ordered[i : i + load] for i in range(0, len(ordered), load)
+        ]
+        self._maxes: list[Any] = [b[-1] for b in self._buckets]
+        self._len: int = len(ordered)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[Any]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __contains__(self, key: Any) -> bool:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return False
+        bucket = self._buckets[i]
+        return bucket[bisect_left(bucket, key)] == key
+
+    def add(self, key: Any) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            return
+        i = min(bisect_right(self._maxes, key), len(self._maxes) - 1)
+        bucket = self._buckets[i]
+        insort(bucket, key)
+        self._maxes[i] = bucket[-1]
+        self._len += 1
+        if len(bucket) > 2 * self.load:
+            half = bucket[self.load :]
+            del bucket[self.load :]
+            self._buckets.insert(i + 1, half)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, half[-1])
+
+    def discard(self, key: Any) -> None:
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return
+        bucket = self._buckets[i]
+        j = bisect_left(bucket, key)
+        if bucket[j] != key:
+            return
+        del bucket[j]
+        self._len -= 1
+        if bucket:
+            self._maxes[i] = bucket[-1]
+        else:
+            del self._buckets[i]
+            del self._maxes[i]
+
+    def approx_bytes(self) -> int:
+        return sum(map(sys.getsizeof, self._buckets)) + approx_size(
+            self, self._len
+        )
+
+
+class SortedView:
+    """Task ids in one sort order, updated as tasks change.
+
+    Callers remove a task *before* changing it and add it back after,
+    since its position is found from the key of its current state.
+    """
+
+    def __init__(self, spec: str, tasks: Iterable[Task]) -> None:
+        self.spec: str = spec
+        self.key: Callable[[Task], SortKey] = sort_key(spec)
+        self._keys: SortedKeyList = SortedKeyList(map(self.key, tasks))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in self._keys:
+            yield key[-1]
+
+    def add(self, task: Task) -> None:
+        self._keys.add(self.key(task))
+
+    def remove(self, task: Task) -> None:
+        self._keys.discard(self.key(task))
+
+    def approx_bytes(self) -> int:
+        return self._keys.approx_bytes()
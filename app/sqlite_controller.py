@@ -0,0 +1,875 @@
+import json
+import sqlite3
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextlib import contextmanager
+from os import PathLike
+from typing import Any, overload
+
+from app.events import (
+    CATEGORY_ADDED,
+    CATEGORY_REMOVED,
+    TASK_ADDED,
+    TASK_COMPLETED,
+    TASK_REMOVED,
+    TASK_UPDATED,
+    Change,
+    ChangeFeed,
+)
+from app.history import History, Op, task_state
+from app.models import Category, Task, TaskCounts
+from app.query import Condition, field_key
+
+DEFAULT_CATEGORIES = ["All", "Work", "Personal", "Shopping"]
+# Ids bound per statement when looking up many tasks at once
+MAX_SQL_IDS = 900
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    position INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    text_lower TEXT NOT NULL,
+    category TEXT,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_category
+    ON tasks (category, completed, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, id);
+-- Serves the title sort; title search goes through tasks_fts
+CREATE INDEX IF NOT EXISTS idx_tasks_text_lower ON tasks (text_lower, id);
+CREATE TABLE IF NOT EXISTS task_fields (
+    task_id INTEGER NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    key TEXT NOT NULL,
+    value,
+    -- field_key() of value: REAL for numbers, lowercased TEXT otherwise;
+    -- SQLite orders every REAL before any TEXT, as field_key does
+    sort_value,
+    PRIMARY KEY (task_id, key)
+) WITHOUT ROWID;
+DROP INDEX IF EXISTS idx_task_fields_key_value;
+CREATE INDEX IF NOT EXISTS idx_task_fields_key_sort
+    ON task_fields (key, sort_value, task_id);
+"""
+
+
+# Trigram index over titles for substring search (SQLite 3.34+). Kept in
+# step with tasks by triggers; filled from tasks when first created.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE tasks_fts USING fts5(
+    text_lower, content = 'tasks', content_rowid = 'id',
+    tokenize = 'trigram'
+);
+CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO tasks_fts (rowid, text_lower)
+        VALUES (new.id, new.text_lower);
+END;
+CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, text_lower)
+        VALUES ('delete', old.id, old.text_lower);
+END;
+CREATE TRIGGER tasks_fts_update AFTER UPDATE OF text_lower ON tasks BEGIN
+    INSERT INTO tasks_fts (tasks_fts, rowid, text_lower)
+        VALUES ('delete', old.id, old.text_lower);
+    INSERT INTO tasks_fts (rowid, text_lower)
+        VALUES (new.id, new.text_lower);
+END;
+INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild');
+"""
+# Total and completed tasks per category, kept by triggers so the
+# sidebar badges cost a read of one small table per change.
+COUNTS_SCHEMA = """
+CREATE TABLE category_counts (
+    category TEXT UNIQUE,
+    total INTEGER NOT NULL,
+    completed INTEGER NOT NULL
+);
+CREATE TRIGGER category_counts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO category_counts (category, total, completed)
+        SELECT new.category, 0, 0 WHERE NOT EXISTS (
+            SELECT 1 FROM category_counts WHERE category IS new.category
+        );
+    UPDATE category_counts
+        SET total = total + 1, completed = completed + new.completed
+        WHERE category IS new.category;
+END;
+CREATE TRIGGER category_counts_delete AFTER DELETE ON tasks BEGIN
+    UPDATE category_counts
+        SET total = total - 1, completed = completed - old.completed
+        WHERE category IS old.category;
+END;
+CREATE TRIGGER category_counts_update
+AFTER UPDATE OF category, completed ON tasks BEGIN
+    UPDATE category_counts
+        SET total = total - 1, completed = completed - old.completed
+        WHERE category IS old.category;
+    INSERT INTO category_counts (category, total, completed)
+        SELECT new.category, 0, 0 WHERE NOT EXISTS (
+            SELECT 1 FROM category_counts WHERE category IS new.category
+        );
+    UPDATE category_counts
+        SET total = total + 1, completed = completed + new.completed
+        WHERE category IS new.category;
+END;
+INSERT INTO category_counts (category, total, completed)
+    SELECT category, COUNT(*), SUM(completed) FROM tasks GROUP BY category;
+"""
+# The trigram index can only answer queries of at least this many
+# characters; shorter ones scan text_lower.
+FTS_MIN_QUERY = 3
+
+
+def _to_sql_value(value: object) -> object:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, default=str)
+
+
+def _sort_value(value: object) -> float | str:
+    return field_key(value)[1]
+
+
+def _condition_sql(condition: Condition) -> tuple[str, list[object]]:
+    want = field_key(condition.value)
+    sql = "SELECT task_id FROM task_fields WHERE key = ? AND sort_value {} ?"
+    params: list[object] = [condition.key]
+    if condition.op in ("=", "!="):
+        sql = sql.format("=")
+    else:
+        sql = sql.format(condition.op)
+        sql += " AND typeof(sort_value) = ?"
+    params.append(want[1])
+    if condition.op not in ("=", "!="):
+        params.append("real" if want[0] == 0 else "text")
+    negate = "NOT " if condition.op == "!=" else ""
+    return f"id {negate}IN ({sql})", params
+
+
+def _order_sql(sort: str) -> tuple[str, list[object]]:
+    # Same orders as app.sorted_view.sort_key
+    if sort == "id":
+        return "id", []
+    if sort == "title":
+        return "text_lower, id", []
+    if sort == "completed":
+        return "completed, id", []
+    if sort.startswith("field:") and len(sort) > 6:
+        value = (
+            "(SELECT sort_value FROM task_fields"
+            " WHERE task_id = tasks.id AND key = ?)"
+        )
+        return f"{value} IS NULL, {value}, id", [sort[6:]] * 2
+    raise ValueError(f"Unknown sort: {sort!r}")
+
+
+class LazyTaskList(Sequence[Task]):
+    """Read-only sequence of tasks that materializes rows page by page.
+
+    Only the matching ids are fetched up front; Task objects are built on
+    first access and kept in a small LRU page cache.
+    """
+
+    page_size: int = 256
+    max_pages: int = 64
+
+    def __init__(
+        self, controller: "SQLiteController", ids: list[int]
+    ) -> None:
+        self._controller = controller
+        self._ids = ids
+        self._pages: OrderedDict[int, list[Task]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> Task: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Task]: ...
+
+    def __getitem__(self, index: int | slice) -> Task | list[Task]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self._ids)
+        if not 0 <= index < len(self._ids):
+            raise IndexError("task index out of range")
+        page_no, offset = divmod(index, self.page_size)
+        page = self._pages.get(page_no)
+        if page is None:
+            start = page_no * self.page_size
+            page = self._controller.fetch_tasks(
+                self._ids[start : start + self.page_size]
+            )
+            self._pages[page_no] = page
+            if len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_no)
+        return page[offset]
+
+    def __iter__(self) -> Iterator[Task]:
+        for i in range(len(self._ids)):
+            yield self[i]
+
+    @property
+    def ids(self) -> list[int]:
+        return self._ids
+
+
+class SQLiteController:
+    """ToDoController backed by a local SQLite database.
+
+    Category, status, search and custom-field lookups run as indexed SQL
+    and task lists are returned as LazyTaskList, so large databases open
+    without loading every row.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str] = ":memory:",
+        write_behind: bool = False,
+    ) -> None:
+        self.conn: sqlite3.Connection = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self._add_sort_values()
+        self.conn.executescript(SCHEMA)
+        self._fts: bool = self._create_derived("tasks_fts", FTS_SCHEMA)
+        self._create_derived("category_counts", COUNTS_SCHEMA)
+        self._batch_depth: int = 0
+        self.version: int = 0
+        self.changes: ChangeFeed = ChangeFeed()
+        # With write_behind, changes stay in an open transaction until
+        # ``save`` so a burst of edits costs one commit.
+        self.write_behind: bool = write_behind
+        self.on_dirty: Callable[[], None] | None = None
+        self._unsaved: int = 0
+        self.history: History | None = None
+        if not self.conn.execute("SELECT 1 FROM categories").fetchone():
+            self.conn.executemany(
+                "INSERT INTO categories (name) VALUES (?)",
+                [(n,) for n in DEFAULT_CATEGORIES],
+            )
+            self.conn.commit()
+        self.categories: list[Category] = [
+            Category(name)
+            for (name,) in self.conn.execute(
+                "SELECT name FROM categories ORDER BY position"
+            )
+        ]
+
+    def _add_sort_values(self) -> None:
+        # Databases from before sort_value get the column filled once
+        columns = [
+            row[1]
+            for row in self.conn.execute("PRAGMA table_info(task_fields)")
+        ]
+        if not columns or "sort_value" in columns:
+            return
+        with self.conn:
+            self.conn.execute("ALTER TABLE task_fields ADD COLUMN sort_value")
+            self.conn.executemany(
+                "UPDATE task_fields SET sort_value = ?"
+                " WHERE task_id = ? AND key = ?",
+                [
+                    (_sort_value(value), task_id, key)
+                    for task_id, key, value in self.conn.execute(
+                        "SELECT task_id, key, value FROM task_fields"
+                    ).fetchall()
+                ],
+            )
+
+    def _create_derived(self, name: str, script: str) -> bool:
+        """Run ``script`` to create and fill table ``name`` if missing.
+
+        Returns False when this SQLite cannot create it (no FTS5 or no
+        trigram tokenizer for tasks_fts; search then scans text_lower).
+        """
+        if self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (name,)
+        ).fetchone():
+            return True
+        try:
+            self.conn.executescript("BEGIN;" + script + "COMMIT;")
+        except sqlite3.OperationalError:
+            self.conn.rollback()
+            return False
+        return True
+
+    # Rows are read on demand, so there is no deferred load to step
+    loading: bool = False
+
+    def load_step(self, count: int = 0) -> bool:
+        return False
+
+    def finish_loading(self) -> None:
+        pass
+
+    @property
+    def tasks(self) -> LazyTaskList:
+        return self.get_tasks_by_category("All")
+
+    def iter_tasks(self) -> Iterator[Task]:
+        """Every task in id order, fetched a page at a time."""
+        last = 0
+        while True:
+            ids = [
+                row[0]
+                for row in self.conn.execute(
+                    "SELECT id FROM tasks WHERE id > ? ORDER BY id LIMIT ?",
+                    (last, LazyTaskList.page_size),
+                )
+            ]
+            if not ids:
+                return
+            yield from self.fetch_tasks(ids)
+            last = ids[-1]
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group several mutations into a single transaction."""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and not self.write_behind:
+                self.conn.commit()
+
+    def _commit(
+        self,
+        task_ids: Iterable[int] = (),
+        categories: Iterable[str] = (),
+        kind: str | None = TASK_UPDATED,
+    ) -> None:
+        # Same contract as ToDoController._changed
+        self.version += 1
+        if kind is not None and self.changes.subscribed:
+            names = {c.name for c in self.categories}
+            self.changes.publish(
+                [
+                    *(
+                        Change(
+                            CATEGORY_ADDED if n in names else CATEGORY_REMOVED,
+                            n,
+                        )
+                        for n in categories
+                    ),
+                    *(Change(kind, i) for i in task_ids),
+                ]
+            )
+        if self.write_behind:
+            self._unsaved += 1
+            if self.on_dirty is not None:
+                self.on_dirty()
+        elif self._batch_depth == 0:
+            self.conn.commit()
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        return bool(self._unsaved)
+
+    def save(self) -> int:
+        """Commit pending changes; returns how many mutations were saved."""
+        saved = self._unsaved
+        if not saved or self._batch_depth:
+            return 0
+        self.conn.commit()
+        self._unsaved = 0
+        return saved
+
+    def add_category(self, name: str) -> bool:
+        if name and name not in [c.name for c in self.categories]:
+            self._insert_category(name)
+            self._record("Add category", ("category-", name))
+            self._commit(categories=(name,))
+            return True
+        return False
+
+    def _insert_category(self, name: str) -> None:
+        self.conn.execute("INSERT INTO categories (name) VALUES (?)", (name,))
+        self.categories.append(Category(name))
+
+    def add_task(
+        self, title: str, category: str | None, **custom_fields: object
+    ) -> Task:
+        cur = self.conn.execute(
+            "INSERT INTO tasks (text, text_lower, category) VALUES (?, ?, ?)",
+            (title, title.lower(), category),
+        )
+        task_id = cur.lastrowid or 0
+        self._write_fields(task_id, custom_fields)
+        self._record("Add task", ("delete", (task_id,)))
+        self._commit((task_id,), kind=TASK_ADDED)
+        return Task(
+            title,
+            category=category,
+            custom_fields=custom_fields,
+            task_id=task_id,
+        )
+
+    def add_tasks(
+        self, records: Iterable[Mapping[str, Any]], merge_undo: bool = False
+    ) -> list[Task]:
+        """Insert many tasks in one transaction; see ToDoController."""
+        added: list[Task] = []
+        known = {c.name for c in self.categories}
+        new_categories: list[str] = []
+        with self.batch():
+            for record in records:
+                category = record.get("category")
+                if category is not None and category not in known:
+                    known.add(category)
+                    self._insert_category(category)
+                    new_categories.append(category)
+                fields = record.get("custom_fields") or {}
+                completed = bool(record.get("completed", False))
+                text = record["text"]
+                cur = self.conn.execute(
+                    "INSERT INTO tasks (text, text_lower, category, completed)"
+                    " VALUES (?, ?, ?, ?)",
+                    (text, text.lower(), category, int(completed)),
+                )
+                task_id = cur.lastrowid or 0
+                self._write_fields(task_id, fields)
+                added.append(
+                    Task(
+                        text,
+                        category=category,
+                        custom_fields=fields,
+                        completed=completed,
+                        task_id=task_id,
+                    )
+                )
+            self._record(
+                "Import tasks",
+                ("delete", tuple(t.id for t in added)),
+                *(("category-", name) for name in new_categories),
+                merge=merge_undo,
+            )
+            self._commit(
+                [t.id for t in added], new_categories, kind=TASK_ADDED
+            )
+        return added
+
+    def get_task(self, task_id: int) -> Task | None:
+        found = self.fetch_tasks([task_id])
+        return found[0] if found else None
+
+    def edit_task(
+        self, task_id: int, title: str, **custom_fields: object
+    ) -> bool:
+        if self.history is not None:
+            old = self.get_task(task_id)
+            if old is not None:
+                self._record(
+                    "Edit task",
+                    ("edit", task_id, old.text, old.custom_fields),
+                )
+        cur = self.conn.execute(
+            "UPDATE tasks SET text = ?, text_lower = ? WHERE id = ?",
+            (title, title.lower(), task_id),
+        )
+        if not cur.rowcount:
+            return False
+        self.conn.execute(
+            "DELETE FROM task_fields WHERE task_id = ?", (task_id,)
+        )
+        self._write_fields(task_id, custom_fields)
+        self._commit((task_id,))
+        return True
+
+    def move_task(self, task_id: int, new_category: str | None) -> bool:
+        if self.history is not None:
+            old = self.get_task(task_id)
+            if old is not None:
+                self._record("Move task", ("move", task_id, old.category))
+        cur = self.conn.execute(
+            "UPDATE tasks SET category = ? WHERE id = ?",
+            (new_category, task_id),
+        )
+        self._commit((task_id,) if cur.rowcount else ())
+        return bool(cur.rowcount)
+
+    def complete_task(self, task_id: int) -> bool:
+        if self.history is not None:
+            old = self.get_task(task_id)
+            if old is not None:
+                self._record(
+                    "Complete task", ("complete", task_id, old.completed)
+                )
+        cur = self.conn.execute(
+            "UPDATE tasks SET completed = 1 WHERE id = ?", (task_id,)
+        )
+        self._commit((task_id,) if cur.rowcount else (), kind=TASK_COMPLETED)
+        return bool(cur.rowcount)
+
+    def delete_task(self, task_id: int) -> bool:
+        if self.history is not None:
+            old = self.get_task(task_id)
+            if old is not None:
+                self._record("Delete task", ("restore", (task_state(old),)))
+        cur = self.conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+        self._commit((task_id,) if cur.rowcount else (), kind=TASK_REMOVED)
+        return bool(cur.rowcount)
+
+    def complete_many(self, task_ids: Iterable[int]) -> int:
+        ids = [
+            row[0]
+            for row in self._select_ids(
+                "SELECT id FROM tasks WHERE id IN ({ids}) AND completed = 0",
+                list(dict.fromkeys(task_ids)),
+            )
+        ]
+        if not ids:
+            return 0
+        self._record("Complete tasks", *(("complete", i, False) for i in ids))
+        self.conn.executemany(
+            "UPDATE tasks SET completed = 1 WHERE id = ?", [(i,) for i in ids]
+        )
+        self._commit(ids, kind=TASK_COMPLETED)
+        return len(ids)
+
+    def delete_many(self, task_ids: Iterable[int]) -> int:
+        ids = list(dict.fromkeys(task_ids))
+        if self.history is not None:
+            removed = self.fetch_tasks(ids)
+            ids = [t.id for t in removed]
+            if removed:
+                self._record(
+                    "Delete tasks",
+                    ("restore", tuple(map(task_state, removed))),
+                )
+        else:
+            ids = [
+                row[0]
+                for row in self._select_ids(
+                    "SELECT id FROM tasks WHERE id IN ({ids})", ids
+                )
+            ]
+        if not ids:
+            return 0
+        self.conn.executemany(
+            "DELETE FROM tasks WHERE id = ?", [(i,) for i in ids]
+        )
+        self._commit(ids, kind=TASK_REMOVED)
+        return len(ids)
+
+    def move_many(
+        self, task_ids: Iterable[int], new_category: str | None
+    ) -> int:
+        rows = self._select_ids(
+            "SELECT id, category FROM tasks"
+            " WHERE id IN ({ids}) AND category IS NOT ?",
+            list(dict.fromkeys(task_ids)),
+            (new_category,),
+        )
+        if not rows:
+            return 0
+        self._record("Move tasks", *(("move", i, old) for i, old in rows))
+        self.conn.executemany(
+            "UPDATE tasks SET category = ? WHERE id = ?",
+            [(new_category, i) for i, _ in rows],
+        )
+        self._commit([i for i, _ in rows])
+        return len(rows)
+
+    def get_tasks_by_category(self, category: str | None) -> LazyTaskList:
+        return self.query_tasks(category)
+
+    def query_tasks(
+        self,
+        category: str | None,
+        status: str = "All",
+        text: str = "",
+        fields: dict[str, object] | None = None,
+        conditions: Sequence[Condition] = (),
+        sort: str = "id",
+    ) -> LazyTaskList:
+        where: list[str] = []
+        params: list[object] = []
+        if category != "All":
+            if category is None:
+                where.append("category IS NULL")
+            else:
+                where.append("category = ?")
+                params.append(category)
+        if status == "Completed":
+            where.append("completed = 1")
+        elif status == "Incomplete":
+            where.append("completed = 0")
+        text = text.strip().lower()
+        if text:
+            escaped = (
+                text.replace("\\", "\\\\")
+                .replace("%", "\\%")
+                .replace("_", "\\_")
+            )
+            if self._fts and len(text) >= FTS_MIN_QUERY:
+                # Trigram candidates; LIKE below confirms the substring
+                where.append(
+                    "id IN (SELECT rowid FROM tasks_fts"
+                    " WHERE tasks_fts MATCH ?)"
+                )
+                params.append('"' + text.replace('"', '""') + '"')
+            where.append("text_lower LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        # Each condition is a lookup on the (key, value) index
+        for condition in [
+            *conditions,
+            *(Condition(k, "=", str(v)) for k, v in (fields or {}).items()),
+        ]:
+            clause, values = _condition_sql(condition)
+            where.append(clause)
+            params.extend(values)
+        sql = "SELECT id FROM tasks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        order, order_params = _order_sql(sort)
+        sql += " ORDER BY " + order
+        ids = [
+            row[0] for row in self.conn.execute(sql, params + order_params)
+        ]
+        return LazyTaskList(self, ids)
+
+    def category_counts(self) -> dict[str | None, TaskCounts]:
+        # category_counts is kept current by triggers on tasks
+        counts: dict[str | None, TaskCounts] = {
+            category: TaskCounts(total, done)
+            for category, total, done in self.conn.execute(
+                "SELECT category, total, completed FROM category_counts"
+                " WHERE total > 0"
+            )
+        }
+        counts["All"] = TaskCounts(
+            sum(c.total for c in counts.values()),
+            sum(c.completed for c in counts.values()),
+        )
+        return counts
+
+    def field_names(self) -> list[str]:
+        return [
+            row[0]
+            for row in self.conn.execute(
+                "SELECT DISTINCT key FROM task_fields ORDER BY key"
+            )
+        ]
+
+    def fetch_tasks(self, ids: list[int]) -> list[Task]:
+        """Materialize tasks for ``ids``, preserving their order."""
+        if not ids:
+            return []
+        fields: dict[int, dict[str, object]] = {}
+        for task_id, key, value in self._select_ids(
+            "SELECT task_id, key, value FROM task_fields"
+            " WHERE task_id IN ({ids})",
+            ids,
+        ):
+            fields.setdefault(task_id, {})[key] = value
+        by_id: dict[int, Task] = {}
+        for task_id, text, category, completed in self._select_ids(
+            "SELECT id, text, category, completed FROM tasks"
+            " WHERE id IN ({ids})",
+            ids,
+        ):
+            by_id[task_id] = Task(
+                text,
+                category=category,
+                custom_fields=fields.get(task_id),
+                completed=bool(completed),
+                task_id=task_id,
+            )
+        return [by_id[i] for i in ids if i in by_id]
+
+    def _select_ids(
+        self, sql: str, ids: list[int], params: Sequence[object] = ()
+    ) -> list[tuple[Any, ...]]:
+        """Rows of ``sql`` for ``ids``, queried in chunks.
+
+        ``sql`` has an ``{ids}`` placeholder for the id list; ``params``
+        bind after the ids. Chunks keep each statement under SQLite's
+        host parameter limit (999 on older builds).
+        """
+        rows: list[tuple[Any, ...]] = []
+        for start in range(0, len(ids), MAX_SQL_IDS):
+            chunk = ids[start : start + MAX_SQL_IDS]
+            rows.extend(
+                self.conn.execute(
+                    sql.format(ids=",".join("?" * len(chunk))),
+                    [*chunk, *params],
+                )
+            )
+        return rows
+
+    def delete_category(self, name: str) -> bool:
+        if name == "All":
+            return False
+        ids = self.get_tasks_by_category(name).ids
+        if self.history is not None:
+            names = [c.name for c in self.categories]
+            removed = self.fetch_tasks(ids)
+            self._record(
+                "Delete category",
+                *(
+                    [("category+", name, names.index(name))]
+                    if name in names
+                    else []
+                ),
+                ("restore", tuple(map(task_state, removed))),
+            )
+        self.conn.execute("DELETE FROM categories WHERE name = ?", (name,))
+        self.conn.execute("DELETE FROM tasks WHERE category = ?", (name,))
+        self.categories = [c for c in self.categories if c.name != name]
+        self._commit(ids, (name,), kind=TASK_REMOVED)
+        return True
+
+    def task_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def undo(self) -> str | None:
+        """Revert the last recorded change; returns its label."""
+        if self.history is None:
+            return None
+        return self.history.undo(self._apply_ops)
+
+    def redo(self) -> str | None:
+        if self.history is None:
+            return None
+        return self.history.redo(self._apply_ops)
+
+    def approx_memory(self) -> int | None:
+        # Tasks live on disk; only the lazily loaded pages are in memory.
+        return None
+
+    def close(self) -> None:
+        self.save()
+        self.conn.close()
+
+    def _record(self, label: str, *ops: Op, merge: bool = False) -> None:
+        if self.history is not None:
+            self.history.record(label, list(ops), merge)
+
+    def _apply_ops(self, ops: list[Op]) -> list[Op]:
+        """Apply undo (or redo) operations; returns their inverse."""
+        inverse: list[Op] = []
+        changes: list[Change] = []
+        with self.batch():
+            for op in ops:
+                kind = op[0]
+                if kind == "delete":
+                    removed = self.fetch_tasks(list(op[1]))
+                    self.conn.executemany(
+                        "DELETE FROM tasks WHERE id = ?",
+                        [(t.id,) for t in removed],
+                    )
+                    changes.extend(Change(TASK_REMOVED, t.id) for t in removed)
+                    inverse.append(
+                        ("restore", tuple(map(task_state, removed)))
+                    )
+                elif kind == "restore":
+                    for task_id, text, category, fields, completed in op[1]:
+                        self.conn.execute(
+                            "INSERT INTO tasks"
+                            " (id, text, text_lower, category, completed)"
+                            " VALUES (?, ?, ?, ?, ?)",
+                            (
+                                task_id,
+                                text,
+                                text.lower(),
+                                category,
+                                int(completed),
+                            ),
+                        )
+                        self._write_fields(task_id, fields)
+                        changes.append(Change(TASK_ADDED, task_id))
+                    inverse.append(
+                        ("delete", tuple(state[0] for state in op[1]))
+                    )
+                elif kind in ("category+", "category-"):
+                    name = op[1]
+                    names = [c.name for c in self.categories]
+                    if kind == "category+" and name not in names:
+                        self.categories.insert(op[2], Category(name))
+                        inverse.append(("category-", name))
+                        changes.append(Change(CATEGORY_ADDED, name))
+                    elif kind == "category-" and name in names:
+                        del self.categories[names.index(name)]
+                        inverse.append(("category+", name, names.index(name)))
+                        changes.append(Change(CATEGORY_REMOVED, name))
+                    self._write_categories()
+                else:
+                    task = self.get_task(op[1])
+                    if task is None:
+                        continue
+                    if kind == "edit":
+                        inverse.append(
+                            ("edit", task.id, task.text, task.custom_fields)
+                        )
+                        self.conn.execute(
+                            "UPDATE tasks SET text = ?, text_lower = ?"
+                            " WHERE id = ?",
+                            (op[2], op[2].lower(), task.id),
+                        )
+                        self.conn.execute(
+                            "DELETE FROM task_fields WHERE task_id = ?",
+                            (task.id,),
+                        )
+                        self._write_fields(task.id, op[3])
+                    elif kind == "move":
+                        inverse.append(("move", task.id, task.category))
+                        self.conn.execute(
+                            "UPDATE tasks SET category = ? WHERE id = ?",
+                            (op[2], task.id),
+                        )
+                    elif kind == "complete":
+                        inverse.append(("complete", task.id, task.completed))
+                        self.conn.execute(
+                            "UPDATE tasks SET completed = ? WHERE id = ?",
+                            (int(op[2]), task.id),
+                        )
+                    changes.append(
+                        Change(
+                            TASK_COMPLETED
+                            if kind == "complete"
+                            else TASK_UPDATED,
+                            task.id,
+                        )
+                    )
+            self._commit(kind=None)
+            self.changes.publish(changes)
+        inverse.reverse()
+        return inverse
+
+    def _write_categories(self) -> None:
+        # Positions are implicit in insertion order, so rewrite them all
+        self.conn.execute("DELETE FROM categories")
+        self.conn.executemany(
+            "INSERT INTO categories (name) VALUES (?)",
+            [(c.name,) for c in self.categories],
+        )
+
+    def _write_fields(
+        self, task_id: int, custom_fields: Mapping[str, object]
+    ) -> None:
+        if custom_fields:
+            self.conn.executemany(
+                "INSERT INTO task_fields (task_id, key, value, sort_value)"
+                " VALUES (?, ?, ?, ?)",
+                [
+                    (task_id, key, stored, _sort_value(stored))
+                    for key, value in custom_fields.items()
+                    for stored in (_to_sql_value(value),)
+                ],
+            )
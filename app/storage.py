@@ -0,0 +1,135 @@
+import json
+import os
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+JOURNAL_FILE = "journal.jsonl"
+SNAPSHOT_VERSION = 1
+
+
+def default_data_dir() -> Path:
+    env = os.environ.get("TODO_LIST_DATA_DIR")
+    if env:
+        return Path(env)
+    return Path.home() / ".to-do-list"
+
+
+class JournalStore:
+    """Snapshot plus append-only journal of state records.
+
+    Every record is an idempotent upsert or removal of a single task or
+    category, so replaying a journal tail onto any snapshot taken before
+    it yields the same state. The snapshot is itself JSON Lines: a header
+    line followed by one line per task.
+
+    Each ``append`` is a single journal line (several records are wrapped
+    in a ``batch`` record) that is fsynced, so a save either lands whole
+    or, if interrupted, is dropped as a torn final line on the next load.
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str], min_compact: int = 1000
+    ) -> None:
+        self.directory: Path = Path(directory)
+        self.snapshot_path: Path = self.directory / SNAPSHOT_FILE
+        self.journal_path: Path = self.directory / JOURNAL_FILE
+        self.min_compact: int = min_compact
+        self.journal_entries: int = 0
+        self._journal: IO[str] | None = None
+
+    def has_snapshot(self) -> bool:
+        return self.snapshot_path.exists()
+
+    def read_snapshot(self) -> Iterator[dict[str, Any]]:
+        """Yield the snapshot header, then one record per task."""
+        if not self.snapshot_path.exists():
+            return
+        with self.snapshot_path.open(encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def read_journal(self) -> Iterator[dict[str, Any]]:
+        """Yield the journal's records in order.
+
+        Reading stops at a torn final line, which is cut off the file once
+        the records before it have been read, so the next ``append``
+        starts on a fresh line instead of extending the torn one.
+        """
+        self.journal_entries = 0
+        if not self.journal_path.exists():
+            return
+        good = 0  # byte offset just past the last whole line
+        torn = False
+        with self.journal_path.open("rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    # A write interrupted before its newline
+                    torn = True
+                    break
+                if not line.strip():
+                    good += len(line)
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    torn = True
+                    break
+                good += len(line)
+                if record.get("op") == "batch":
+                    self.journal_entries += len(record["records"])
+                    yield from record["records"]
+                else:
+                    self.journal_entries += 1
+                    yield record
+        if torn:
+            self.close()
+            os.truncate(self.journal_path, good)
+
+    def append(self, records: Iterable[dict[str, Any]]) -> None:
+        records = list(records)
+        if not records:
+            return
+        line = json.dumps(
+            records[0]
+            if len(records) == 1
+            else {"op": "batch", "records": records},
+            default=str,
+        )
+        if self._journal is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._journal = self.journal_path.open("a", encoding="utf-8")
+        self._journal.write(line + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self.journal_entries += len(records)
+
+    def should_compact(self, live_records: int) -> bool:
+        # Compacting only once the journal outgrows the live data keeps
+        # the amortized cost of each write proportional to the change.
+        return self.journal_entries >= max(self.min_compact, live_records)
+
+    def compact(
+        self, header: dict[str, Any], tasks: Iterable[dict[str, Any]]
+    ) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.snapshot_path.with_suffix(".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            f.write(json.dumps({**header, "version": SNAPSHOT_VERSION}))
+            f.write("\n")
+            for record in tasks:
+                f.write(json.dumps(record, default=str))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.close()
+        self.journal_path.open("w", encoding="utf-8").close()
+        self.journal_entries = 0
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
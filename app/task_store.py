@@ -0,0 +1,350 @@
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from heapq import merge
+from operator import itemgetter
+from typing import TypeVar
+
+from app.models import NO_FIELDS, Task, intern_name
+from app.perf import approx_size
+
+V = TypeVar("V")
+
+
+def insert_in_order(
+    mapping: dict[int, V], items: Iterable[tuple[int, V]]
+) -> None:
+    """Insert ``items`` into an id-ordered dict, keeping it in id order.
+
+    Only the entries after the smallest new id are moved, so restoring
+    recently deleted tasks is cheap.
+    """
+    new = sorted(items, key=itemgetter(0))
+    if not new:
+        return
+    first = new[0][0]
+    if not mapping or first > next(reversed(mapping)):
+        mapping.update(new)
+        return
+    tail: list[tuple[int, V]] = []
+    while mapping:
+        key, value = mapping.popitem()
+        if key < first:
+            mapping[key] = value
+            break
+        tail.append((key, value))
+    tail.reverse()
+    mapping.update(merge(tail, new, key=itemgetter(0)))
+
+
+class DictTaskStore:
+    """Default task store: live Task objects in an id -> Task dict."""
+
+    def __init__(self) -> None:
+        self._tasks: dict[int, Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self._tasks
+
+    def get(self, task_id: int) -> Task | None:
+        return self._tasks.get(task_id)
+
+    def text(self, task_id: int) -> str | None:
+        task = self._tasks.get(task_id)
+        return None if task is None else task.text
+
+    def add(self, task: Task) -> None:
+        self._tasks[task.id] = task
+
+    def update(self, task: Task) -> None:
+        self._tasks[task.id] = task
+
+    def remove(self, task_id: int) -> Task | None:
+        return self._tasks.pop(task_id, None)
+
+    def remove_many(self, task_ids: Iterable[int]) -> list[Task]:
+        pop = self._tasks.pop
+        return [t for t in (pop(i, None) for i in task_ids) if t is not None]
+
+    def restore(self, tasks: Iterable[Task]) -> None:
+        """Add previously removed tasks back at their id positions."""
+        insert_in_order(self._tasks, ((t.id, t) for t in tasks))
+
+    def ids(self) -> Iterator[int]:
+        return iter(self._tasks)
+
+    def values(self) -> Iterator[Task]:
+        return iter(self._tasks.values())
+
+    def approx_bytes(self) -> int:
+        return sys.getsizeof(self._tasks) + approx_size(
+            self._tasks.values(), len(self._tasks)
+        )
+
+
+class ColumnarTaskStore:
+    """Column-oriented task store for very large lists.
+
+    Tasks are kept as parallel columns instead of one object per task:
+    ids, category codes and text offsets in arrays, completed and alive
+    flags in bytearrays, text as UTF-8 in one shared buffer, and custom
+    fields in a sparse row -> mapping dict. Ids normally arrive in
+    increasing order, so rows are found by bisecting the id column; an
+    id -> row dict is only built if that ever stops being true.
+
+    ``get`` and ``values`` build short-lived Task views, so callers must
+    hand changed tasks back through ``update``. Deleted rows and replaced
+    text are garbage until the columns are compacted.
+    """
+
+    def __init__(self) -> None:
+        self._ids: array[int] = array("q")
+        self._alive: bytearray = bytearray()
+        self._completed: bytearray = bytearray()
+        self._categories: array[int] = array("i")
+        self._text_start: array[int] = array("q")
+        self._text_len: array[int] = array("i")
+        self._text: bytearray = bytearray()
+        self._fields: dict[int, Mapping[str, object]] = {}
+        self._rows: dict[int, int] | None = None
+        self._category_names: list[str | None] = []
+        self._category_codes: dict[str | None, int] = {}
+        self._live: int = 0
+        self._dead_text: int = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    def __contains__(self, task_id: object) -> bool:
+        return isinstance(task_id, int) and self._row(task_id) is not None
+
+    def get(self, task_id: int) -> Task | None:
+        row = self._row(task_id)
+        return None if row is None else self._task(row)
+
+    def text(self, task_id: int) -> str | None:
+        row = self._row(task_id)
+        return None if row is None else self._text_at(row)
+
+    def add(self, task: Task) -> None:
+        if self._row(task.id) is not None:
+            self.update(task)
+            return
+        row = len(self._ids)
+        if self._rows is None and row and task.id <= self._ids[-1]:
+            self._rows = {
+                i: r for r, i in enumerate(self._ids) if self._alive[r]
+            }
+        if self._rows is not None:
+            self._rows[task.id] = row
+        self._ids.append(task.id)
+        self._alive.append(1)
+        self._completed.append(task.completed)
+        self._categories.append(self._code(task.category))
+        self._text_start.append(0)
+        self._text_len.append(0)
+        self._set_text(row, task.text)
+        if task.custom_fields:
+            self._fields[row] = task.custom_fields
+        self._live += 1
+
+    def update(self, task: Task) -> None:
+        row = self._row(task.id)
+        if row is None:
+            raise KeyError(task.id)
+        if task.text != self._text_at(row):
+            self._dead_text += self._text_len[row]
+            self._set_text(row, task.text)
+        self._completed[row] = task.completed
+        self._categories[row] = self._code(task.category)
+        if task.custom_fields:
+            self._fields[row] = task.custom_fields
+        else:
+            self._fields.pop(row, None)
+        self._maybe_compact()
+
+    def remove(self, task_id: int) -> Task | None:
+        task = self._kill(task_id)
+        self._maybe_compact()
+        return task
+
+    def remove_many(self, task_ids: Iterable[int]) -> list[Task]:
+        """Remove several tasks, compacting at most once afterwards."""
+        removed = [t for t in map(self._kill, task_ids) if t is not None]
+        self._maybe_compact()
+        return removed
+
+    def restore(self, tasks: Iterable[Task]) -> None:
+        """Add previously removed tasks back at their id positions.
+
+        Rows from the first restored id onwards are rebuilt (dropping
+        dead rows on the way); text already in the buffer is reused.
+        """
+        new = sorted(tasks, key=lambda t: t.id)
+        if not new:
+            return
+        if self._rows is None and (
+            not self._ids or new[0].id > self._ids[-1]
+        ):
+            for task in new:
+                self.add(task)
+            return
+        start = bisect_left(self._ids, new[0].id) if self._rows is None else 0
+        old = [r for r in range(start, len(self._ids)) if self._alive[r]]
+        if self._rows is not None:
+            old.sort(key=self._ids.__getitem__)
+        ids = array("q")
+        completed = bytearray()
+        categories = array("i")
+        text_start = array("q")
+        text_len = array("i")
+        fields: dict[int, Mapping[str, object]] = {
+            r: f for r, f in self._fields.items() if r < start
+        }
+        rows = merge(
+            ((self._ids[r], r) for r in old),
+            ((t.id, t) for t in new),
+            key=itemgetter(0),
+        )
+        for row, (task_id, source) in enumerate(rows, start):
+            ids.append(task_id)
+            if isinstance(source, Task):
+                data = source.text.encode()
+                text_start.append(len(self._text))
+                text_len.append(len(data))
+                self._text += data
+                completed.append(source.completed)
+                categories.append(self._code(source.category))
+                if source.custom_fields:
+                    fields[row] = source.custom_fields
+            else:
+                text_start.append(self._text_start[source])
+                text_len.append(self._text_len[source])
+                completed.append(self._completed[source])
+                categories.append(self._categories[source])
+                if source in self._fields:
+                    fields[row] = self._fields[source]
+        self._ids[start:] = ids
+        self._alive[start:] = bytearray(b"\x01") * len(ids)
+        self._completed[start:] = completed
+        self._categories[start:] = categories
+        self._text_start[start:] = text_start
+        self._text_len[start:] = text_len
+        self._fields = fields
+        self._live += len(new)
+        # Rows are in id order again, so bisect works from here on
+        self._rows = None
+
+    def ids(self) -> Iterator[int]:
+        alive = self._alive
+        return (i for r, i in enumerate(self._ids) if alive[r])
+
+    def values(self) -> Iterator[Task]:
+        alive = self._alive
+        return (self._task(r) for r in range(len(self._ids)) if alive[r])
+
+    def approx_bytes(self) -> int:
+        columns = (
+            self._ids,
+            self._alive,
+            self._completed,
+            self._categories,
+            self._text_start,
+            self._text_len,
+            self._text,
+        )
+        size = sum(sys.getsizeof(c) for c in columns)
+        size += sys.getsizeof(self._fields) + approx_size(
+            self._fields.values(), len(self._fields)
+        )
+        if self._rows is not None:
+            size += sys.getsizeof(self._rows)
+        return size
+
+    def _row(self, task_id: int) -> int | None:
+        if self._rows is not None:
+            return self._rows.get(task_id)
+        row = bisect_left(self._ids, task_id)
+        if (
+            row < len(self._ids)
+            and self._ids[row] == task_id
+            and self._alive[row]
+        ):
+            return row
+        return None
+
+    def _kill(self, task_id: int) -> Task | None:
+        row = self._row(task_id)
+        if row is None:
+            return None
+        task = self._task(row)
+        self._alive[row] = 0
+        self._fields.pop(row, None)
+        self._dead_text += self._text_len[row]
+        if self._rows is not None:
+            del self._rows[task_id]
+        self._live -= 1
+        return task
+
+    def _task(self, row: int) -> Task:
+        task = Task.__new__(Task)
+        task.id = self._ids[row]
+        task.text = self._text_at(row)
+        task.category = self._category_names[self._categories[row]]
+        task.custom_fields = self._fields.get(row, NO_FIELDS)
+        task.completed = bool(self._completed[row])
+        return task
+
+    def _text_at(self, row: int) -> str:
+        start = self._text_start[row]
+        return self._text[start : start + self._text_len[row]].decode()
+
+    def _set_text(self, row: int, text: str) -> None:
+        data = text.encode()
+        self._text_start[row] = len(self._text)
+        self._text_len[row] = len(data)
+        self._text += data
+
+    def _code(self, category: str | None) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self._category_names)
+            category = intern_name(category)
+            self._category_names.append(category)
+            self._category_codes[category] = code
+        return code
+
+    def _maybe_compact(self) -> None:
+        dead_rows = len(self._ids) - self._live
+        if (dead_rows > 1024 and dead_rows * 2 > len(self._ids)) or (
+            self._dead_text > 65536 and self._dead_text * 2 > len(self._text)
+        ):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = [r for r in range(len(self._ids)) if self._alive[r]]
+        texts = [self._text_at(r) for r in live]
+        self._ids = array("q", (self._ids[r] for r in live))
+        self._alive = bytearray(b"\x01") * len(live)
+        self._completed = bytearray(self._completed[r] for r in live)
+        self._categories = array("i", (self._categories[r] for r in live))
+        self._fields = {
+            new: self._fields[old]
+            for new, old in enumerate(live)
+            if old in self._fields
+        }
+        self._text = bytearray()
+        self._text_start = array("q", bytes(8 * len(live)))
+        self._text_len = array("i", bytes(4 * len(live)))
+        for row, text in enumerate(texts):
+            self._set_text(row, text)
+        if self._rows is not None:
+            self._rows = {i: r for r, i in enumerate(self._ids)}
+        self._dead_text = 0
+
+
+TaskStore = DictTaskStore | ColumnarTaskStore
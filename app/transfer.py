@@ -0,0 +1,204 @@
+import csv
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from itertools import batched
+from pathlib import Path
+from typing import IO, Any
+
+from app.models import Task
+
+# An imported task: the same shape as a journal task record, minus the id
+TaskRecord = dict[str, Any]
+
+CSV_COLUMNS = ["text", "category", "completed"]
+TEXT_KEYS = ("text", "title")
+# Keys a flat row reads as something other than a custom field
+RESERVED_KEYS = frozenset((*CSV_COLUMNS, *TEXT_KEYS, "id", "custom_fields"))
+# CSV column prefix for custom fields whose name is reserved
+FIELD_PREFIX = "field:"
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "done", "completed"}
+CHUNK_SIZE = 2000
+
+
+def read_tasks(path: str | os.PathLike[str]) -> Iterator[TaskRecord]:
+    """Stream task records from a .jsonl or .csv file."""
+    if Path(path).suffix.lower() == ".csv":
+        return read_csv(path)
+    return read_jsonl(path)
+
+
+def read_jsonl(path: str | os.PathLike[str]) -> Iterator[TaskRecord]:
+    """One JSON object per line.
+
+    Custom fields may be given as a ``custom_fields`` object or as extra
+    top-level keys.
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"line {number}: {e.msg}") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"line {number}: expected an object")
+            record = _to_record(row)
+            if record is not None:
+                yield record
+
+
+def read_csv(path: str | os.PathLike[str]) -> Iterator[TaskRecord]:
+    """A header row, then one task per row.
+
+    Columns other than text, category and completed become custom fields;
+    empty cells are left out. A ``field:`` column is always a custom
+    field, named without the prefix.
+    """
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            cells = {
+                k.strip(): v
+                for k, v in row.items()
+                if k and v not in ("", None)
+            }
+            fields = {
+                k.removeprefix(FIELD_PREFIX): cells.pop(k)
+                for k in list(cells)
+                if k.startswith(FIELD_PREFIX)
+            }
+            record = _to_record(cells)
+            if record is not None:
+                record["custom_fields"].update(fields)
+                yield record
+
+
+def _to_record(row: dict[str, Any]) -> TaskRecord | None:
+    row = {k.strip(): v for k, v in row.items()}
+    text = next((row.pop(k) for k in TEXT_KEYS if k in row), None)
+    for key in TEXT_KEYS:
+        row.pop(key, None)
+    if text is None or not str(text).strip():
+        return None
+    completed = row.pop("completed", False)
+    if isinstance(completed, str):
+        completed = completed.strip().lower() in TRUE_VALUES
+    fields = row.pop("custom_fields", None) or {}
+    if not isinstance(fields, dict):
+        fields = {}
+    row.pop("id", None)
+    category = row.pop("category", None)
+    fields.update(row)
+    return {
+        "text": str(text).strip(),
+        "category": category if category != "" else None,
+        "completed": bool(completed),
+        "custom_fields": fields,
+    }
+
+
+def read_batches(
+    path: str | os.PathLike[str], size: int = CHUNK_SIZE
+) -> Iterator[list[TaskRecord]]:
+    for chunk in batched(read_tasks(path), size):
+        yield list(chunk)
+
+
+def task_record(task: Task) -> TaskRecord:
+    return {
+        "text": task.text,
+        "category": task.category,
+        "completed": task.completed,
+        "custom_fields": dict(task.custom_fields),
+    }
+
+
+def write_tasks(
+    path: str | os.PathLike[str],
+    records: Iterable[TaskRecord],
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Write task records to a .jsonl or .csv file in a single pass.
+
+    ``progress`` is called with the running count every CHUNK_SIZE
+    records. The file is written to a temporary name and moved into
+    place at the end; returns the number of tasks written.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with tmp.open("w", encoding="utf-8", newline="") as f:
+            if path.suffix.lower() == ".csv":
+                count = _write_csv(f, records, progress)
+            else:
+                count = _write_jsonl(f, records, progress)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
+
+
+def _write_jsonl(
+    f: IO[str],
+    records: Iterable[TaskRecord],
+    progress: Callable[[int], None] | None,
+) -> int:
+    count = 0
+    for chunk in batched(records, CHUNK_SIZE):
+        f.write(
+            "".join(
+                json.dumps(r, ensure_ascii=False, default=str) + "\n"
+                for r in chunk
+            )
+        )
+        count += len(chunk)
+        if progress is not None:
+            progress(count)
+    return count
+
+
+def _write_csv(
+    f: IO[str],
+    records: Iterable[TaskRecord],
+    progress: Callable[[int], None] | None,
+) -> int:
+    # Field columns are only known once every record has been seen, so
+    # rows are spooled first and the header is written in front at the
+    # end. Rows written before a column appeared are just shorter.
+    columns = list(CSV_COLUMNS)
+    position: dict[str, int] = {}
+    count = 0
+    with tempfile.TemporaryFile("w+", encoding="utf-8", newline="") as body:
+        writer = csv.writer(body)
+        for record in records:
+            row: list[object] = [
+                record["text"],
+                record["category"] or "",
+                "true" if record["completed"] else "false",
+            ]
+            for key, value in record["custom_fields"].items():
+                i = position.get(key)
+                if i is None:
+                    i = position[key] = len(columns)
+                    columns.append(_csv_column(key))
+                row.extend([""] * (i + 1 - len(row)))
+                row[i] = value
+            writer.writerow(row)
+            count += 1
+            if progress is not None and not count % CHUNK_SIZE:
+                progress(count)
+        csv.writer(f).writerow(columns)
+        body.seek(0)
+        shutil.copyfileobj(body, f)
+    return count
+
+
+def _csv_column(key: str) -> str:
+    """Header for a custom field, prefixed if read_csv would misread it."""
+    name = key.strip()
+    if not name or name in RESERVED_KEYS or name.startswith(FIELD_PREFIX):
+        return FIELD_PREFIX + key
+    return key
@@ -0,0 +1,245 @@
+import queue
+import threading
+import tkinter as tk
+from collections.abc import Callable, Iterator
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+POLL_MS = 20
+
+_local = threading.local()
+
+
+class Job:
+    """Handle for work submitted to a TkExecutor."""
+
+    def __init__(
+        self,
+        executor: "TkExecutor",
+        key: str | None,
+        on_done: Callable[[Any], None] | None,
+        on_error: Callable[[BaseException], None] | None,
+        on_progress: Callable[[Any], None] | None,
+    ) -> None:
+        self.key: str | None = key
+        self.on_done: Callable[[Any], None] | None = on_done
+        self.on_error: Callable[[BaseException], None] | None = on_error
+        self.on_progress: Callable[[Any], None] | None = on_progress
+        self.future: Future[Any] | None = None
+        self._executor: TkExecutor = executor
+        self._cancelled: threading.Event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """Drop the job's result; stops it outright if not yet started.
+
+        A running job keeps going unless it polls ``cancelled`` (see
+        ``current_job``), but none of its callbacks will fire.
+        """
+        self._executor.cancel_job(self)
+
+    def report(self, value: Any) -> None:
+        """Send a progress value to ``on_progress`` on the Tk thread."""
+        if self.on_progress is not None and not self.cancelled:
+            self._executor._results.put((self, "progress", value))
+
+
+def current_job() -> Job | None:
+    """The job running on the calling worker thread, if any."""
+    return getattr(_local, "job", None)
+
+
+def report_progress(value: Any) -> None:
+    job = current_job()
+    if job is not None:
+        job.report(value)
+
+
+def iter_feed(feed: "queue.Queue[list[T] | None]") -> Iterator[T]:
+    """Yield items that the Tk thread puts on ``feed`` in chunks.
+
+    Lets a worker consume data that may only be read on the Tk thread
+    (task objects, the SQLite connection). None ends the stream; if the
+    current job is cancelled while waiting, CancelledError is raised.
+    """
+    while True:
+        try:
+            chunk = feed.get(timeout=0.1)
+        except queue.Empty:
+            job = current_job()
+            if job is not None and job.cancelled:
+                raise CancelledError from None
+            continue
+        if chunk is None:
+            return
+        yield from chunk
+
+
+def feed_job[T](
+    after: Callable[..., object],
+    job: Job,
+    feed: "queue.Queue[list[T] | None]",
+    chunks: Iterator[list[T]],
+) -> None:
+    """Put ``chunks`` on ``feed`` for a job reading it with ``iter_feed``.
+
+    Runs on the Tk thread, one chunk per turn scheduled with ``after``
+    (``root.after``), and waits while the feed is full. It stops once
+    the job is cancelled or has finished, so a worker that fails midway
+    does not leave it polling a feed no one reads.
+    """
+    if job.cancelled or (job.future is not None and job.future.done()):
+        return
+    if feed.full():
+        after(10, feed_job, after, job, feed, chunks)
+        return
+    chunk = next(chunks, None)
+    if chunk is None:
+        feed.put(None)
+        return
+    feed.put(chunk)
+    after(1, feed_job, after, job, feed, chunks)
+
+
+class TkExecutor:
+    """Thread pool whose callbacks run on the Tk thread.
+
+    Workers never touch Tk: results, errors and progress reports go
+    through a queue that ``root.after`` drains while jobs are pending.
+    Submitting with a ``key`` cancels the previous job with that key, so
+    only the latest search, import step, etc. delivers its result.
+    ``on_busy`` is called with True when work starts and False once the
+    last pending job has been delivered.
+    """
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        max_workers: int = 2,
+        on_busy: Callable[[bool], None] | None = None,
+    ) -> None:
+        self.root: tk.Tk = root
+        self.on_busy: Callable[[bool], None] | None = on_busy
+        self._pool: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="todo-worker"
+        )
+        self._results: queue.SimpleQueue[tuple[Job, str, Any]] = (
+            queue.SimpleQueue()
+        )
+        self._jobs: set[Job] = set()
+        self._by_key: dict[str, Job] = {}
+        self._poll: str | None = None
+        self._busy: bool = False
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._jobs)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        key: str | None = None,
+        on_done: Callable[[Any], None] | None = None,
+        on_error: Callable[[BaseException], None] | None = None,
+        on_progress: Callable[[Any], None] | None = None,
+    ) -> Job:
+        job = Job(self, key, on_done, on_error, on_progress)
+        if key is not None:
+            previous = self._by_key.get(key)
+            if previous is not None:
+                self._stop(previous)
+            self._by_key[key] = job
+        self._jobs.add(job)
+        job.future = self._pool.submit(self._run, job, fn, args)
+        self._set_busy(True)
+        if self._poll is None:
+            self._poll = self.root.after(POLL_MS, self._drain)
+        return job
+
+    def cancel(self, key: str) -> None:
+        job = self._by_key.get(key)
+        if job is not None:
+            self.cancel_job(job)
+
+    def cancel_job(self, job: Job) -> None:
+        self._stop(job)
+        self._settle()
+
+    def shutdown(self) -> None:
+        for job in list(self._jobs):
+            self._stop(job)
+        if self._poll is not None:
+            self.root.after_cancel(self._poll)
+            self._poll = None
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(
+        self, job: Job, fn: Callable[..., Any], args: tuple[Any, ...]
+    ) -> None:
+        if job.cancelled:
+            return
+        _local.job = job
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            self._results.put((job, "error", e))
+        else:
+            self._results.put((job, "done", result))
+        finally:
+            _local.job = None
+
+    def _stop(self, job: Job) -> None:
+        job._cancelled.set()
+        if job.future is not None:
+            job.future.cancel()
+        self._forget(job)
+
+    def _forget(self, job: Job) -> None:
+        self._jobs.discard(job)
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+
+    def _drain(self) -> None:
+        self._poll = None
+        while True:
+            try:
+                job, kind, value = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if job.cancelled:
+                continue
+            if kind == "progress":
+                if job.on_progress is not None:
+                    job.on_progress(value)
+                continue
+            callback = job.on_done if kind == "done" else job.on_error
+            try:
+                if callback is not None:
+                    callback(value)
+                elif kind == "error":
+                    self.root.report_callback_exception(
+                        type(value), value, value.__traceback__
+                    )
+            finally:
+                # Forgotten only now so a follow-up job submitted from the
+                # callback does not flicker the busy indicator.
+                self._forget(job)
+        self._settle()
+
+    def _settle(self) -> None:
+        if not self._jobs:
+            self._set_busy(False)
+        elif self._poll is None:
+            self._poll = self.root.after(POLL_MS, self._drain)
+
+    def _set_busy(self, busy: bool) -> None:
+        if busy != self._busy:
+            self._busy = busy
+            if self.on_busy is not None:
+                self.on_busy(busy)
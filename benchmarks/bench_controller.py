@@ -0,0 +1,174 @@
+"""Headless benchmark suite for ToDoController hot paths.
+
+Drives the controller without Tk on synthetic datasets and reports
+per-operation timings as JSON. Pass --baseline to compare against an
+earlier run; the exit status is 1 if any median regressed by more than
+--threshold.
+
+Usage:
+    python -m benchmarks.bench_controller --output results.json
+    python -m benchmarks.bench_controller --baseline results.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+from app.controller import ToDoController
+from app.task_store import ColumnarTaskStore, DictTaskStore
+from benchmarks.common import categories, dataset, summarize
+
+CATEGORY_COUNT = 200
+SAMPLES = 500
+QUERIES = ["review", "rep", "plan fix", "groceries 12", "zzz"]
+
+
+def _sample(
+    fn: Callable[[Any], Any], args: list[Any], warm_up: bool = True
+) -> dict[str, float]:
+    # Operations that change what they act on (completing, deleting)
+    # pass warm_up=False, or the first timed call would find it done.
+    if warm_up:
+        fn(args[0])
+    samples: list[float] = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def run_size(n: int, store: str, seed: int = 1) -> dict[str, Any]:
+    rng = random.Random(seed)
+    names = categories(CATEGORY_COUNT)
+    rows = dataset(n, CATEGORY_COUNT, seed)
+    controller = ToDoController(
+        task_store=(
+            ColumnarTaskStore() if store == "columnar" else DictTaskStore()
+        )
+    )
+    results: dict[str, Any] = {}
+
+    samples: list[float] = []
+    for title, category, fields in rows:
+        start = time.perf_counter()
+        controller.add_task(title, category, **fields)
+        samples.append(time.perf_counter() - start)
+    results["add_task"] = summarize(samples)
+
+    picked = [rng.choice(names) for _ in range(200)]
+    results["get_tasks_by_category"] = _sample(
+        controller.get_tasks_by_category, picked
+    )
+    results["get_tasks_by_category[All]"] = _sample(
+        controller.get_tasks_by_category, ["All"] * 5
+    )
+    for status in ("Completed", "Incomplete"):
+        results[f"filter[{status}]"] = _sample(
+            lambda c, status=status: controller.query_tasks(c, status),
+            picked,
+        )
+    results["search[category]"] = _sample(
+        lambda args: controller.query_tasks(args[0], "All", args[1]),
+        [(rng.choice(names), q) for q in QUERIES * 40],
+    )
+    results["search[All]"] = _sample(
+        lambda q: controller.query_tasks("All", "All", q), QUERIES
+    )
+
+    ids = rng.sample(range(1, n + 1), min(SAMPLES, n))
+    results["edit_task"] = _sample(
+        lambda i: controller.edit_task(i, f"edited {i}", priority="high"),
+        ids,
+    )
+    results["complete_task"] = _sample(
+        controller.complete_task, ids, warm_up=False
+    )
+    results["delete_task"] = _sample(
+        controller.delete_task, ids, warm_up=False
+    )
+    results["delete_category"] = _sample(
+        controller.delete_category, rng.sample(names, 10), warm_up=False
+    )
+    return results
+
+
+def compare(
+    current: dict[str, Any], baseline: dict[str, Any], threshold: float
+) -> list[str]:
+    regressions: list[str] = []
+    for size, ops in current["results"].items():
+        for op, stats in ops.items():
+            old = baseline.get("results", {}).get(size, {}).get(op)
+            if not old or not old["median_us"]:
+                continue
+            ratio = stats["median_us"] / old["median_us"]
+            line = (
+                f"{op:<32}{size:>9}"
+                f"{old['median_us']:>12.1f}{stats['median_us']:>12.1f}"
+                f"{ratio:>8.2f}x"
+            )
+            if ratio > threshold:
+                regressions.append(line)
+            print(line + ("  REGRESSION" if ratio > threshold else ""))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--store", choices=["dict", "columnar"], default="dict"
+    )
+    parser.add_argument("--output", help="write JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="median slowdown ratio that counts as a regression",
+    )
+    args = parser.parse_args()
+
+    report: dict[str, Any] = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "store": args.store,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for n in args.sizes:
+        print(f"running {n} tasks...", file=sys.stderr)
+        report["results"][str(n)] = run_size(n, args.store)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    elif not args.baseline:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(
+            f"{'operation':<32}{'tasks':>9}{'base (us)':>12}"
+            f"{'now (us)':>12}{'ratio':>9}"
+        )
+        if compare(report, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
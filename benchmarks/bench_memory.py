@@ -0,0 +1,118 @@
+"""Measure task model memory with tracemalloc.
+
+Usage: python -m benchmarks.bench_memory [--sizes 100000 1000000]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from app.controller import ToDoController
+from app.models import Task
+from app.task_store import ColumnarTaskStore, DictTaskStore
+
+CATEGORIES = [f"Category {i}" for i in range(20)]
+
+
+class LegacyTask:
+    """The pre-__slots__ Task layout, kept for comparison."""
+
+    def __init__(
+        self,
+        text: str,
+        category: str | None = None,
+        custom_fields: dict[str, object] | None = None,
+        completed: bool = False,
+    ) -> None:
+        self.text = text
+        self.category = category
+        self.custom_fields = custom_fields or {}
+        self.completed = completed
+
+
+def _fields(i: int) -> dict[str, object]:
+    return {"priority": "high"} if i % 5 == 0 else {}
+
+
+def _legacy(n: int) -> Any:
+    return [
+        LegacyTask(f"task {i}", CATEGORIES[i % 20], _fields(i), i % 3 == 0)
+        for i in range(n)
+    ]
+
+
+def _store(store_cls: Any) -> Callable[[int], Any]:
+    def build(n: int) -> Any:
+        store = store_cls()
+        for i in range(n):
+            store.add(
+                Task(
+                    f"task {i}",
+                    category=CATEGORIES[i % 20],
+                    custom_fields=_fields(i),
+                    completed=i % 3 == 0,
+                    task_id=i + 1,
+                )
+            )
+        return store
+
+    return build
+
+
+def _controller(store_cls: Any) -> Callable[[int], Any]:
+    def build(n: int) -> Any:
+        controller = ToDoController(task_store=store_cls())
+        for i in range(n):
+            controller.add_task(f"task {i}", CATEGORIES[i % 20], **_fields(i))
+        return controller
+
+    return build
+
+
+def measure(build: Callable[[int], Any], n: int) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return after - before
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--no-controller",
+        action="store_true",
+        help="skip full controllers (which include the search index)",
+    )
+    args = parser.parse_args()
+    cases: list[tuple[str, Callable[[int], Any]]] = [
+        ("list of __dict__ tasks (old layout)", _legacy),
+        ("DictTaskStore (__slots__ tasks)", _store(DictTaskStore)),
+        ("ColumnarTaskStore", _store(ColumnarTaskStore)),
+    ]
+    if not args.no_controller:
+        cases += [
+            ("ToDoController + DictTaskStore", _controller(DictTaskStore)),
+            (
+                "ToDoController + ColumnarTaskStore",
+                _controller(ColumnarTaskStore),
+            ),
+        ]
+    print(f"{'model':<40}{'tasks':>10}{'MiB':>10}{'bytes/task':>12}")
+    for n in args.sizes:
+        for name, build in cases:
+            used = measure(build, n)
+            print(f"{name:<40}{n:>10}{used / 2**20:>10.1f}{used / n:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare the in-memory and SQLite controllers on the GUI's queries.
+
+Usage: python -m benchmarks.bench_sqlite [--tasks N] [--db PATH]
+"""
+
+import argparse
+import os
+import tempfile
+from functools import partial
+from typing import Any
+
+from app.controller import ToDoController
+from app.sqlite_controller import SQLiteController
+from benchmarks.common import Row, categories, dataset, timed
+
+CATEGORIES = categories(50)
+
+
+def _load(controller: Any, rows: list[Row]) -> None:
+    for title, category, fields in rows:
+        controller.add_task(title, category, **fields)
+
+
+def run(n: int, db_path: str) -> list[tuple[str, float, float]]:
+    rows = dataset(n)
+    memory = ToDoController()
+    sqlite = SQLiteController(db_path)
+    results: list[tuple[str, float, float]] = []
+
+    t_mem, _ = timed(lambda: _load(memory, rows))
+
+    def load_sqlite() -> None:
+        with sqlite.batch():
+            _load(sqlite, rows)
+
+    t_sql, _ = timed(load_sqlite)
+    results.append(("insert all", t_mem, t_sql))
+    sqlite.close()
+
+    t_open, sqlite = timed(lambda: SQLiteController(db_path))
+    results.append(("open existing", 0.0, t_open))
+
+    queries: list[tuple[str, tuple[Any, ...], dict[str, Any]]] = [
+        ("category", (CATEGORIES[7],), {}),
+        ("category + incomplete", (CATEGORIES[7], "Incomplete"), {}),
+        ("all + completed", ("All", "Completed"), {}),
+        ("category + search", (CATEGORIES[7], "All", "review"), {}),
+        ("field priority=high", ("All",), {"fields": {"priority": "high"}}),
+    ]
+    for name, args, kwargs in queries:
+        t_mem, _ = timed(partial(memory.query_tasks, *args, **kwargs))
+        t_sql, lazy = timed(partial(sqlite.query_tasks, *args, **kwargs))
+        results.append((name, t_mem, t_sql))
+        t_page, _ = timed(partial(lazy.__getitem__, slice(50)))
+        results.append((f"  first 50 rows of {name}", 0.0, t_page))
+    sqlite.close()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=500_000)
+    parser.add_argument("--db", help="database file (default: temp file)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or os.path.join(tmp, "bench.sqlite3")
+        results = run(args.tasks, db_path)
+    print(f"{'operation':<40}{'memory (ms)':>14}{'sqlite (ms)':>14}")
+    for name, t_mem, t_sql in results:
+        print(f"{name:<40}{t_mem * 1000:>14.2f}{t_sql * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
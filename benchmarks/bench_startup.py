@@ -0,0 +1,97 @@
+"""Measure cold startup of the Tk app: time to first interactive paint.
+
+Each run starts a fresh interpreter that opens a journal of N tasks and
+builds the main window. "interactive" is when the first paint has been
+processed and the window takes input; "loaded" is when every task is in
+memory. Compares the deferred load the app uses with loading everything
+before the window is built. Needs a display.
+
+Usage: python -m benchmarks.bench_startup [--tasks N] [--runs R]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import categories, dataset
+
+
+def _write_data(directory: str, n: int) -> None:
+    from app.storage import JournalStore
+
+    names = categories(50)
+    JournalStore(directory).compact(
+        {"next_id": n + 1, "categories": ["All", *names]},
+        (
+            {
+                "id": i,
+                "text": title,
+                "category": category,
+                "custom_fields": fields,
+                "completed": i % 3 == 0,
+            }
+            for i, (title, category, fields) in enumerate(dataset(n), 1)
+        ),
+    )
+
+
+def _child(directory: str, eager: bool) -> None:
+    # Runs in the measured process; timestamps are wall clock so the
+    # parent can include interpreter start-up.
+    import tkinter as tk
+
+    from app.controller import ToDoController
+    from app.gui.main_window import MainWindow
+    from app.storage import JournalStore
+
+    controller = ToDoController(JournalStore(directory), defer_load=not eager)
+    root = tk.Tk()
+    MainWindow(root, controller)
+    root.update()
+    interactive = time.time()
+    while controller.loading:
+        root.update()
+    loaded = time.time()
+    root.destroy()
+    print(json.dumps({"interactive": interactive, "loaded": loaded}))
+
+
+def _run(directory: str, eager: bool) -> tuple[float, float]:
+    command = [sys.executable, "-m", "benchmarks.bench_startup"]
+    command += ["--child", directory] + (["--eager"] if eager else [])
+    start = time.time()
+    output = subprocess.run(
+        command, capture_output=True, text=True, check=True
+    ).stdout
+    marks = json.loads(output.splitlines()[-1])
+    return marks["interactive"] - start, marks["loaded"] - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child, args.eager)
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        _write_data(tmp, args.tasks)
+        print(f"{'load':<12}{'interactive (ms)':>20}{'loaded (ms)':>16}")
+        for name, eager in (("deferred", False), ("eager", True)):
+            runs = [_run(tmp, eager) for _ in range(args.runs)]
+            interactive = statistics.median(r[0] for r in runs)
+            loaded = statistics.median(r[1] for r in runs)
+            print(
+                f"{name:<12}{interactive * 1000:>20.1f}{loaded * 1000:>16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
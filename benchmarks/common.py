@@ -0,0 +1,43 @@
+import random
+import statistics
+import time
+from collections.abc import Callable
+from typing import Any
+
+WORDS = ["alpha", "report", "groceries", "call", "review", "plan", "fix"]
+
+Row = tuple[str, str, dict[str, str]]
+
+
+def categories(count: int) -> list[str]:
+    return [f"Category {i}" for i in range(count)]
+
+
+def dataset(n: int, category_count: int = 50, seed: int = 1) -> list[Row]:
+    rng = random.Random(seed)
+    names = categories(category_count)
+    return [
+        (
+            f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+            rng.choice(names),
+            {"priority": rng.choice(["low", "medium", "high"])},
+        )
+        for i in range(n)
+    ]
+
+
+def timed(fn: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Per-operation statistics in microseconds."""
+    ordered = sorted(samples)
+    return {
+        "ops": len(samples),
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "median_us": statistics.median(ordered) * 1e6,
+        "p95_us": ordered[int(0.95 * (len(ordered) - 1))] * 1e6,
+    }
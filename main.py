@@ -1,5 +1,39 @@
 # main.py
+import argparse
+import logging
+
 from app.app_gui import run_app
 
 if __name__ == "__main__":
-    run_app()
+    parser = argparse.ArgumentParser(description="To-Do List")
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="1",
+        metavar="DIR",
+        help="profile Tk callbacks and write the stats to DIR at exit",
+    )
+    parser.add_argument(
+        "--latency-budget",
+        type=float,
+        metavar="MS",
+        help="log callbacks slower than this while profiling (default 50)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="also trace allocations with tracemalloc while profiling",
+    )
+    parser.add_argument(
+        "--perf-hud",
+        action="store_true",
+        help="show refresh timings and memory in the status bar",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    run_app(
+        profile_dir=args.profile,
+        latency_budget_ms=args.latency_budget,
+        trace_memory=args.trace_memory,
+        perf_hud=args.perf_hud,
+    )
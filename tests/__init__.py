@@ -0,0 +1,12 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Test case with a fresh ``directory`` that is removed afterwards."""
+
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory: Path = Path(tmp.name)
@@ -0,0 +1,159 @@
+import random
+import unittest
+from collections.abc import Callable
+from itertools import product
+from typing import Any
+
+from app.controller import ToDoController
+from app.history import History
+from app.query import parse_query
+from app.sqlite_controller import SQLiteController
+from app.storage import JournalStore
+from app.task_store import ColumnarTaskStore
+from tests import TempDirTestCase
+
+Controller = ToDoController | SQLiteController
+
+CONTROLLERS: list[tuple[str, Callable[[], Controller]]] = [
+    ("dict", ToDoController),
+    ("columnar", lambda: ToDoController(task_store=ColumnarTaskStore())),
+    ("sqlite", SQLiteController),
+]
+
+
+def state(controller: Controller) -> tuple[Any, ...]:
+    """Everything a user can see: categories and every task."""
+    return (
+        [c.name for c in controller.categories],
+        [
+            (t.id, t.text, t.category, dict(t.custom_fields), t.completed)
+            for t in controller.tasks
+        ],
+    )
+
+
+def query_ids(
+    controller: Controller,
+    category: str | None,
+    status: str,
+    source: str,
+    sort: str,
+) -> list[int]:
+    query = parse_query(source)
+    tasks = controller.query_tasks(
+        category, status, query.text, conditions=query.conditions, sort=sort
+    )
+    return [t.id for t in tasks]
+
+
+def populate(controller: Controller, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    for i in range(300):
+        fields: dict[str, object] = {}
+        if rng.random() < 0.6:
+            fields["priority"] = rng.choice(["high", "High", "low"])
+        if rng.random() < 0.5:
+            fields["est"] = rng.choice([1, 2, "3", "4.5", 10, "lots"])
+        if rng.random() < 0.3:
+            fields["due"] = f"2026-{rng.randint(1, 12):02d}-01"
+        controller.add_task(
+            f"task {i} {rng.choice(['fix bug', 'Plan trip', 'review'])}",
+            rng.choice(["Work", "Personal", "Shopping", None]),
+            **fields,
+        )
+    controller.complete_many(range(1, 301, 4))
+    for task_id in range(2, 301, 9):
+        controller.edit_task(task_id, f"edited {task_id} fix", owner="bob")
+    controller.delete_many(range(3, 301, 11))
+
+
+class JournalCategoryTest(TempDirTestCase):
+    def _reload(self, controller: ToDoController) -> ToDoController:
+        controller.close()
+        return ToDoController(JournalStore(self.directory))
+
+    def test_undone_category_delete_keeps_position_after_reload(self) -> None:
+        controller = ToDoController(JournalStore(self.directory))
+        controller.history = History()
+        controller.add_category("Errands")
+        names = [c.name for c in controller.categories]
+        controller.delete_category("Work")
+        controller.undo()
+        self.assertEqual([c.name for c in controller.categories], names)
+
+        controller = self._reload(controller)
+        self.assertEqual([c.name for c in controller.categories], names)
+        controller.close()
+
+
+class UndoRedoTest(unittest.TestCase):
+    def _round_trip(self, controller: Controller) -> None:
+        controller.history = History()
+        populate(controller)
+        controller.history = History()
+        steps: list[Callable[[], object]] = [
+            lambda: controller.add_task("new", "Work", priority="high"),
+            lambda: controller.edit_task(5, "renamed", est=7),
+            lambda: controller.complete_task(6),
+            lambda: controller.complete_task(1),
+            lambda: controller.move_task(7, "Shopping"),
+            lambda: controller.delete_task(8),
+            lambda: controller.complete_many(range(10, 60)),
+            lambda: controller.move_many(range(20, 80), "Personal"),
+            lambda: controller.delete_many(range(40, 120)),
+            lambda: controller.add_category("Errands"),
+            lambda: controller.delete_category("Work"),
+        ]
+        states = [state(controller)]
+        for step in steps:
+            step()
+            states.append(state(controller))
+        for want in reversed(states[:-1]):
+            self.assertIsNotNone(controller.undo())
+            self.assertEqual(state(controller), want)
+        self.assertIsNone(controller.undo())
+        for want in states[1:]:
+            self.assertIsNotNone(controller.redo())
+            self.assertEqual(state(controller), want)
+
+    def test_undo_and_redo_restore_every_step(self) -> None:
+        for name, make in CONTROLLERS:
+            with self.subTest(controller=name):
+                controller = make()
+                self._round_trip(controller)
+                controller.close()
+
+
+class QueryParityTest(unittest.TestCase):
+    def test_query_tasks_matches_in_memory_controller(self) -> None:
+        controllers = [make() for _, make in CONTROLLERS]
+        for controller in controllers:
+            populate(controller)
+        reference, *others = controllers
+        queries = [
+            "",
+            "fix",
+            "FIX bug",
+            "re",
+            "zzz",
+            "priority:high",
+            "priority!=high",
+            "est>=3",
+            "est<3 fix",
+            "est>lots",
+            "due<2026-06-01 review",
+            "owner:bob",
+        ]
+        sorts = ["id", "title", "completed", "field:est", "field:due"]
+        cases = product(
+            ["All", "Work", "Shopping", None],
+            ["All", "Completed", "Incomplete"],
+            queries,
+            sorts,
+        )
+        for case in cases:
+            want = query_ids(reference, *case)
+            for (name, _), other in zip(CONTROLLERS[1:], others, strict=True):
+                self.assertEqual(query_ids(other, *case), want, (name, *case))
+        for controller in controllers:
+            controller.close()
@@ -0,0 +1,90 @@
+import unittest
+
+from app.events import TASK_COMPLETED, TASK_UPDATED, Change
+from app.history import History
+from app.models import TaskCounts
+from app.sqlite_controller import SQLiteController
+
+
+class SQLiteBulkTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.controller = SQLiteController()
+        self.controller.history = History()
+        self.addCleanup(self.controller.close)
+
+    def test_delete_large_category_with_history(self) -> None:
+        # More ids than SQLite binds in one statement
+        self.controller.add_tasks(
+            {"text": f"task {i}", "category": "Big"} for i in range(40_000)
+        )
+        self.assertTrue(self.controller.delete_category("Big"))
+        self.assertEqual(self.controller.task_count(), 0)
+        self.controller.undo()
+        self.assertEqual(self.controller.task_count(), 40_000)
+
+    def test_bulk_changes_publish_only_changed_rows(self) -> None:
+        work = self.controller.add_task("a", "Work")
+        done = self.controller.add_task("b", "Personal")
+        self.controller.complete_task(done.id)
+        received: list[Change] = []
+        self.controller.changes.subscribe(received.extend)
+
+        self.assertEqual(self.controller.complete_many([work.id, done.id]), 1)
+        self.assertEqual(received, [Change(TASK_COMPLETED, work.id)])
+        received.clear()
+        self.assertEqual(
+            self.controller.move_many([work.id, done.id, 99], "Personal"), 1
+        )
+        self.assertEqual(received, [Change(TASK_UPDATED, work.id)])
+
+
+class SQLiteCountsTest(unittest.TestCase):
+    def test_counts_follow_every_mutation(self) -> None:
+        controller = SQLiteController()
+        controller.history = History()
+        tasks = [
+            controller.add_task(f"t{i}", ["Work", "Personal", None][i % 3])
+            for i in range(30)
+        ]
+        controller.complete_many(t.id for t in tasks[::2])
+        controller.move_many([t.id for t in tasks[:10]], "Shopping")
+        controller.delete_many(t.id for t in tasks[5:15])
+        controller.delete_category("Personal")
+        controller.undo()
+        controller.undo()
+        controller.redo()
+        controller.complete_task(tasks[1].id)
+
+        want: dict[str | None, TaskCounts] = {}
+        for task in controller.tasks:
+            total, done = want.get(task.category, (0, 0))
+            want[task.category] = TaskCounts(total + 1, done + task.completed)
+        want["All"] = TaskCounts(
+            controller.task_count(),
+            sum(t.completed for t in controller.tasks),
+        )
+        self.assertEqual(controller.category_counts(), want)
+        controller.close()
+
+
+class SQLiteSearchTest(unittest.TestCase):
+    def test_title_search_matches_substrings(self) -> None:
+        controller = SQLiteController()
+        titles = ["Buy milk", "100% done", "a_b c", "Milkshake", "other"]
+        tasks = [controller.add_task(t, "Work") for t in titles]
+        controller.edit_task(tasks[4].id, "Oat MILK")
+        controller.delete_task(tasks[3].id)
+        for query in ["milk", "mi", "100%", "a_b", "xyz", "ilk"]:
+            want = [
+                t.id
+                for t in controller.tasks
+                if query.lower() in t.text.lower()
+            ]
+            self.assertEqual(
+                controller.query_tasks("All", text=query).ids, want, query
+            )
+        controller.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
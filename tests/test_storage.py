@@ -0,0 +1,104 @@
+import unittest
+
+from app.controller import ToDoController
+from app.history import History
+from app.storage import JournalStore
+from tests import TempDirTestCase
+from tests.test_controller import populate, state
+
+
+class TornJournalTest(TempDirTestCase):
+    def test_append_after_torn_line_survives_reload(self) -> None:
+        controller = ToDoController(JournalStore(self.directory))
+        controller.add_task("first", "Work")
+        controller.close()
+        journal = self.directory / "journal.jsonl"
+        with journal.open("a", encoding="utf-8") as f:
+            f.write('{"op": "task", "task": {"id": 2, "te')
+
+        controller = ToDoController(JournalStore(self.directory))
+        self.assertEqual([t.text for t in controller.tasks], ["first"])
+        controller.add_task("second", "Work")
+        controller.add_task("third", None)
+        controller.close()
+
+        controller = ToDoController(JournalStore(self.directory))
+        self.assertEqual(
+            [t.text for t in controller.tasks], ["first", "second", "third"]
+        )
+        controller.close()
+
+    def test_line_without_newline_is_dropped(self) -> None:
+        store = JournalStore(self.directory)
+        store.append([{"op": "category", "name": "A"}])
+        store.close()
+        journal = self.directory / "journal.jsonl"
+        with journal.open("a", encoding="utf-8") as f:
+            f.write('{"op": "category", "name": "B"}')
+        self.assertEqual([r["name"] for r in store.read_journal()], ["A"])
+        store.append([{"op": "category", "name": "C"}])
+        store.close()
+        self.assertEqual(
+            [r["name"] for r in JournalStore(self.directory).read_journal()],
+            ["A", "C"],
+        )
+
+
+class JournalReplayTest(TempDirTestCase):
+    def _open(self, min_compact: int = 1000) -> ToDoController:
+        return ToDoController(JournalStore(self.directory, min_compact))
+
+    def test_reload_replays_journal(self) -> None:
+        controller = self._open()
+        controller.history = History()
+        populate(controller)
+        controller.add_category("Errands")
+        controller.delete_category("Personal")
+        controller.undo()
+        want = state(controller)
+        controller.close()
+        self.assertFalse(JournalStore(self.directory).has_snapshot())
+
+        controller = self._open()
+        self.assertEqual(state(controller), want)
+        self.assertEqual(controller.add_task("next", None).id, 301)
+        controller.close()
+
+    def test_compaction_keeps_state(self) -> None:
+        controller = self._open(min_compact=50)
+        populate(controller)
+        store = JournalStore(self.directory)
+        self.assertTrue(store.has_snapshot())
+        # Compaction emptied the journal, so it holds fewer records than
+        # the 300 adds alone
+        self.assertLess(
+            sum(1 for _ in store.read_journal()), controller.task_count()
+        )
+        controller.edit_task(1, "after compaction")
+        controller.delete_task(4)
+        want = state(controller)
+        controller.close()
+
+        controller = self._open(min_compact=50)
+        self.assertEqual(state(controller), want)
+        controller.close()
+
+    def test_journal_replays_over_stale_snapshot_records(self) -> None:
+        controller = self._open(min_compact=50)
+        populate(controller)
+        # Every task in the snapshot is then changed or deleted in the
+        # journal, which must win over the snapshot's records
+        ids = [t.id for t in controller.tasks]
+        for task_id in ids[::2]:
+            controller.edit_task(task_id, f"late {task_id}")
+        controller.delete_many(ids[1::2])
+        want = state(controller)
+        controller.close()
+
+        controller = self._open(min_compact=50)
+        self.assertEqual(state(controller), want)
+        controller.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
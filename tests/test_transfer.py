@@ -0,0 +1,80 @@
+import unittest
+
+from app.history import History
+from app.transfer import read_batches, read_tasks, write_tasks
+from tests import TempDirTestCase
+from tests.test_controller import CONTROLLERS, state
+
+# Custom fields named like the columns and keys a file reader knows
+AWKWARD_FIELDS: dict[str, object] = {
+    "text": "a field",
+    "title": "another",
+    "category": "c",
+    "completed": "no",
+    "id": "7",
+    "custom_fields": "x",
+    "field:x": "prefixed",
+    "priority": "high",
+}
+
+
+class RoundTripTest(TempDirTestCase):
+    def test_custom_fields_survive_export_and_import(self) -> None:
+        records = [
+            {
+                "text": "with fields",
+                "category": "Work",
+                "completed": True,
+                "custom_fields": AWKWARD_FIELDS,
+            },
+            {
+                "text": "plain",
+                "category": None,
+                "completed": False,
+                "custom_fields": {"priority": "low"},
+            },
+        ]
+        for suffix in (".jsonl", ".csv"):
+            with self.subTest(format=suffix):
+                path = self.directory / f"tasks{suffix}"
+                self.assertEqual(write_tasks(path, records), 2)
+                self.assertEqual(list(read_tasks(path)), records)
+
+
+class ImportUndoTest(TempDirTestCase):
+    def test_chunked_import_is_undone_in_one_step(self) -> None:
+        path = self.directory / "tasks.jsonl"
+        write_tasks(
+            path,
+            (
+                {
+                    "text": f"task {i}",
+                    "category": f"Imported {i % 3}",
+                    "completed": False,
+                    "custom_fields": {},
+                }
+                for i in range(250)
+            ),
+        )
+        for name, make in CONTROLLERS:
+            with self.subTest(controller=name):
+                controller = make()
+                controller.history = History()
+                controller.add_task("before", "Work")
+                before = state(controller)
+                for i, batch in enumerate(read_batches(path, 100)):
+                    controller.add_tasks(batch, merge_undo=i > 0)
+                after = state(controller)
+                self.assertEqual(controller.task_count(), 251)
+
+                self.assertEqual(controller.undo(), "Import tasks")
+                self.assertEqual(state(controller), before)
+                self.assertEqual(controller.redo(), "Import tasks")
+                self.assertEqual(state(controller), after)
+                self.assertEqual(controller.undo(), "Import tasks")
+                self.assertEqual(controller.undo(), "Add task")
+                controller.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
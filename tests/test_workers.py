@@ -0,0 +1,68 @@
+import itertools
+import queue
+import time
+import unittest
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from app.workers import TkExecutor, feed_job, iter_feed
+
+
+class ManualRoot:
+    """The part of tk.Tk a TkExecutor uses, with ``after`` run by hand."""
+
+    def __init__(self) -> None:
+        self.pending: list[tuple[Callable[..., object], tuple[Any, ...]]] = []
+
+    def after(self, ms: int, func: Callable[..., object], *args: Any) -> str:
+        self.pending.append((func, args))
+        return f"after#{len(self.pending)}"
+
+    def after_cancel(self, id: str) -> None:
+        pass
+
+    def run(self, timeout: float = 5.0) -> None:
+        """Run callbacks until none are scheduled or ``timeout`` passes."""
+        deadline = time.monotonic() + timeout
+        while self.pending and time.monotonic() < deadline:
+            func, args = self.pending.pop(0)
+            func(*args)
+            time.sleep(0.001)
+
+
+def failing_writer(records: Iterable[int]) -> int:
+    for _ in records:
+        raise OSError("disk full")
+    return 0
+
+
+class FeedJobTest(unittest.TestCase):
+    def test_feeding_stops_when_the_worker_fails(self) -> None:
+        root = ManualRoot()
+        executor = TkExecutor(root)  # type: ignore[arg-type]
+        self.addCleanup(executor.shutdown)
+        errors: list[BaseException] = []
+        feed: queue.Queue[list[int] | None] = queue.Queue(2)
+        job = executor.submit(
+            failing_writer, iter_feed(feed), on_error=errors.append
+        )
+        # Endless: only the job's failure can end the feeding
+        chunks = ([i] for i in itertools.count())
+        feed_job(root.after, job, feed, chunks)
+
+        root.run()
+        self.assertEqual(root.pending, [])
+        self.assertEqual([type(e) for e in errors], [OSError])
+        self.assertFalse(executor.busy)
+
+    def test_feed_ends_the_stream(self) -> None:
+        root = ManualRoot()
+        executor = TkExecutor(root)  # type: ignore[arg-type]
+        self.addCleanup(executor.shutdown)
+        results: list[int] = []
+        feed: queue.Queue[list[int] | None] = queue.Queue(2)
+        job = executor.submit(sum, iter_feed(feed), on_done=results.append)
+        feed_job(root.after, job, feed, iter([[1, 2], [3], [4, 5, 6]]))
+
+        root.run()
+        self.assertEqual(results, [21])